@@ -0,0 +1,85 @@
+# encoding: utf-8
+"""
+Latency of GET /transactions/{transactionId} against a running server and its database.
+
+Start the server without its caches, so every request reaches the database and kaspad:
+
+    TX_CACHE_MAX_MB=0 RESPONSE_CACHE_MAX_MB=0 NEGATIVE_CACHE_CAPACITY=0 uvicorn main:app --port 8000
+
+Then, from the repository root, with the same SQL_URI:
+
+    python -m benchmarks.get_transaction --url http://localhost:8000 --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import aiohttp
+import psycopg
+
+from dbsession import psycopg_dsn_from_sqlalchemy_url
+
+
+def sample_transaction_ids(count):
+    dsn = psycopg_dsn_from_sqlalchemy_url(os.getenv("SQL_URI", "postgresql+psycopg://127.0.0.1:5432"))
+    with psycopg.connect(dsn) as conn:
+        rows = conn.execute("SELECT transaction_id FROM transactions ORDER BY random() LIMIT %s", (count,)).fetchall()
+    return [row[0].hex() for row in rows]
+
+
+async def run(url, transaction_ids, requests, concurrency, params):
+    latencies = []
+    statuses = {}
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(transaction_ids[i % len(transaction_ids)])
+
+    async def worker(session):
+        while not queue.empty():
+            transaction_id = queue.get_nowait()
+            start = time.perf_counter()
+            async with session.get(f"{url}/transactions/{transaction_id}", params=params) as response:
+                await response.read()
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+
+    async with aiohttp.ClientSession() as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, statuses, elapsed
+
+
+def percentile(values, p):
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--transactions", type=int, default=1000, help="Number of distinct transaction ids to request")
+    parser.add_argument("--resolve-previous-outpoints", default="no", choices=["no", "light", "full"])
+    args = parser.parse_args()
+
+    transaction_ids = sample_transaction_ids(args.transactions)
+    if not transaction_ids:
+        raise SystemExit("No transactions in the database")
+    params = {"resolve_previous_outpoints": args.resolve_previous_outpoints}
+    asyncio.run(run(args.url, transaction_ids, min(args.concurrency, 10), args.concurrency, params))  # warm up
+    latencies, statuses, elapsed = asyncio.run(run(args.url, transaction_ids, args.requests, args.concurrency, params))
+
+    print(f"requests: {len(latencies)}, concurrency: {args.concurrency}, statuses: {statuses}")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(
+        f"latency ms: p50 {percentile(latencies, 50) * 1000:.2f}, p90 {percentile(latencies, 90) * 1000:.2f}, "
+        f"p99 {percentile(latencies, 99) * 1000:.2f}, max {max(latencies) * 1000:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
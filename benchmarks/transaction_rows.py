@@ -0,0 +1,85 @@
+# encoding: utf-8
+"""
+Rows per second loading transactions through the ORM (Transaction entities) versus the raw psycopg path
+(models.Transaction.transactions_by_ids), both producing the dicts the endpoints respond with.
+
+From the repository root, with SQL_URI pointing to an indexed database:
+
+    python -m benchmarks.transaction_rows --batch 500 --rounds 20
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import psycopg
+from sqlalchemy import select
+
+from dbsession import async_session, psycopg_dsn_from_sqlalchemy_url
+from models.Transaction import Transaction, transactions_by_ids
+
+
+def sample_transaction_ids(count):
+    dsn = psycopg_dsn_from_sqlalchemy_url(os.getenv("SQL_URI", "postgresql+psycopg://127.0.0.1:5432"))
+    with psycopg.connect(dsn) as conn:
+        rows = conn.execute("SELECT transaction_id FROM transactions ORDER BY random() LIMIT %s", (count,)).fetchall()
+    return [row[0].hex() for row in rows]
+
+
+async def orm_rows(transaction_ids):
+    async with async_session() as session:
+        transactions = (
+            (await session.execute(select(Transaction).filter(Transaction.transaction_id.in_(transaction_ids))))
+            .scalars()
+            .all()
+        )
+    return [
+        {
+            "subnetwork_id": tx.subnetwork_id,
+            "transaction_id": tx.transaction_id,
+            "hash": tx.hash,
+            "mass": tx.mass,
+            "payload": tx.payload,
+            "block_time": tx.block_time,
+            "version": tx.version,
+            "inputs": [vars(i) for i in tx.inputs] if tx.inputs else None,
+            "outputs": [vars(o) for o in tx.outputs] if tx.outputs else None,
+        }
+        for tx in transactions
+    ]
+
+
+async def raw_rows(transaction_ids):
+    return await transactions_by_ids(transaction_ids)
+
+
+async def measure(load, batches):
+    await load(batches[0])  # warm up the pool and prepared statements
+    rows = 0
+    start = time.perf_counter()
+    for batch in batches:
+        rows += len(await load(batch))
+    return rows, time.perf_counter() - start
+
+
+async def run(batch, rounds):
+    transaction_ids = sample_transaction_ids(batch * rounds)
+    if not transaction_ids:
+        raise SystemExit("No transactions in the database")
+    batches = [transaction_ids[i : i + batch] for i in range(0, len(transaction_ids), batch)]
+    for name, load in (("orm", orm_rows), ("raw", raw_rows), ("orm", orm_rows), ("raw", raw_rows)):
+        rows, elapsed = await measure(load, batches)
+        print(f"{name}: {rows} rows in {elapsed:.3f}s, {rows / elapsed:.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=500, help="Transactions per query")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
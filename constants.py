@@ -1,6 +1,32 @@
 import os
 
 KASPAD_WRPC_URL = os.getenv("KASPAD_WRPC_URL")
+KASPAD_WRPC_POOL_SIZE = int(os.getenv("KASPAD_WRPC_POOL_SIZE", "1"))
+KASPAD_WRPC_POOL_STRATEGY = os.getenv("KASPAD_WRPC_POOL_STRATEGY", "round-robin").lower()
+KASPAD_WRPC_HEAVY_DEDICATED = os.getenv("KASPAD_WRPC_HEAVY_DEDICATED", "false").lower() == "true"
+KASPAD_GRPC_POOL_SIZE = int(os.getenv("KASPAD_GRPC_POOL_SIZE", "2"))
+KASPAD_GRPC_MULTIPLEX = os.getenv("KASPAD_GRPC_MULTIPLEX", "false").lower() == "true"
+KASPAD_BALANCER = os.getenv("KASPAD_BALANCER", "first").lower()
+KASPAD_HEDGE = os.getenv("KASPAD_HEDGE", "false").lower() == "true"
+KASPAD_BREAKER_FAILURES = int(os.getenv("KASPAD_BREAKER_FAILURES", "5"))
+KASPAD_BREAKER_RESET_SECONDS = int(os.getenv("KASPAD_BREAKER_RESET_SECONDS", "30"))
+
+RECENT_BLOCKS_MINUTES = int(os.getenv("RECENT_BLOCKS_MINUTES", "5"))
+RECENT_BLOCKS_MAX_MB = int(os.getenv("RECENT_BLOCKS_MAX_MB", "128"))
+BLOCK_CACHE_MAX_MB = int(os.getenv("BLOCK_CACHE_MAX_MB", "64"))
+BLOCK_CACHE_MIN_DEPTH = int(os.getenv("BLOCK_CACHE_MIN_DEPTH", "1000"))
+NEGATIVE_CACHE_CAPACITY = int(os.getenv("NEGATIVE_CACHE_CAPACITY", "100000"))
+TX_CACHE_MAX_MB = int(os.getenv("TX_CACHE_MAX_MB", "32"))
+TX_CACHE_MIN_DEPTH = int(os.getenv("TX_CACHE_MIN_DEPTH", "1000"))
+OUTPOINT_CACHE_MAX_MB = int(os.getenv("OUTPOINT_CACHE_MAX_MB", "32"))
+RESPONSE_CACHE_MAX_MB = int(os.getenv("RESPONSE_CACHE_MAX_MB", "64"))
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL")
+SHARED_POLLER = os.getenv("SHARED_POLLER", "true").lower() == "true"
+SHARED_POLLER_DIR = os.getenv("SHARED_POLLER_DIR")
+HOT_ADDRESSES_MAX = int(os.getenv("HOT_ADDRESSES_MAX", "1000"))
+HOT_ADDRESS_PROMOTE_AFTER = int(os.getenv("HOT_ADDRESS_PROMOTE_AFTER", "3"))
+SQL_REPLICA_MAX_LAG = float(os.getenv("SQL_REPLICA_MAX_LAG", "1"))
+SQL_REPLICA_MAX_LAG_HISTORY = float(os.getenv("SQL_REPLICA_MAX_LAG_HISTORY", "300"))
 
 USE_SCRIPT_FOR_ADDRESS = os.getenv("USE_SCRIPT_FOR_ADDRESS", "false").lower() == "true"
 PREV_OUT_RESOLVED = os.getenv("PREV_OUT_RESOLVED", "false").lower() == "true"
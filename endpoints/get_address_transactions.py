@@ -5,8 +5,9 @@ from typing import List, Optional
 from fastapi import Path, Query, HTTPException
 from kaspa_script_address import to_script
 from pydantic import BaseModel
-from sqlalchemy import or_, exists
+from sqlalchemy import or_, and_, exists, func, literal, true, union
 from sqlalchemy.future import select
+from starlette.requests import Request
 from starlette.responses import Response
 
 from constants import ADDRESS_EXAMPLE, REGEX_KASPA_ADDRESS, GENESIS_MS
@@ -20,7 +21,8 @@ from endpoints.get_transactions import (
     PreviousOutpointLookupMode,
     AcceptanceMode,
 )
-from helper.utils import add_cache_control
+from helper.cursor import encode_cursor, decode_cursor
+from helper.utils import add_cache_control, not_modified, replica_max_lag
 from models.TransactionAcceptance import TransactionAcceptance
 from models.TxAddrMapping import TxAddrMapping, TxScriptMapping
 from server import app
@@ -31,6 +33,9 @@ DESC_RESOLVE_PARAM = (
     "adds it into each TxInput."
 )
 
+# Acceptance of younger transactions may still change, pages containing them get no ETag
+ETAG_MIN_AGE_MS = 60_000
+
 
 class TransactionsReceivedAndSpent(BaseModel):
     tx_received: str
@@ -57,6 +62,11 @@ async def get_full_transactions_for_address(
     ),
     limit: int = Query(description="The number of records to get", ge=1, le=500, default=50),
     offset: int = Query(description="The offset from which to get records", ge=0, default=0),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Continue after the previous page, use the value of X-Next-Page-Cursor as long as it is present. "
+        "Unlike offset, deep pages are as cheap as the first one.",
+    ),
     fields: str = "",
     resolve_previous_outpoints: PreviousOutpointLookupMode = Query(default="no", description=DESC_RESOLVE_PARAM),
 ):
@@ -69,32 +79,49 @@ async def get_full_transactions_for_address(
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid address: {kaspa_address}")
 
-    async with async_session() as s:
-        if USE_SCRIPT_FOR_ADDRESS:
-            tx_within_limit_offset = await s.execute(
-                select(TxScriptMapping.transaction_id, TxScriptMapping.block_time)
-                .filter(TxScriptMapping.script_public_key == script)
-                .limit(limit)
-                .offset(offset)
-                .order_by(TxScriptMapping.block_time.desc())
-            )
-        else:
-            tx_within_limit_offset = await s.execute(
-                select(TxAddrMapping.transaction_id, TxAddrMapping.block_time)
-                .filter(TxAddrMapping.address == kaspa_address)
-                .limit(limit)
-                .offset(offset)
-                .order_by(TxAddrMapping.block_time.desc())
+    if USE_SCRIPT_FOR_ADDRESS:
+        mapping = TxScriptMapping
+        query = select(mapping.transaction_id, mapping.block_time).filter(mapping.script_public_key == script)
+    else:
+        mapping = TxAddrMapping
+        query = select(mapping.transaction_id, mapping.block_time).filter(mapping.address == kaspa_address)
+
+    cursor_block_time = None
+    if cursor is not None:
+        if offset:
+            raise HTTPException(status_code=400, detail="Only one of [offset, cursor] can be present")
+        try:
+            cursor_block_time, cursor_transaction_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # The first condition alone bounds the index range scan, the second skips what the previous page returned
+        query = query.filter(mapping.block_time <= cursor_block_time).filter(
+            or_(
+                mapping.block_time < cursor_block_time,
+                and_(mapping.block_time == cursor_block_time, mapping.transaction_id < cursor_transaction_id),
             )
+        )
+    # One row more than requested tells whether there is a next page
+    query = query.order_by(mapping.block_time.desc(), mapping.transaction_id.desc()).limit(limit + 1).offset(offset)
+
+    # Pages after a cursor are history, which may be read from a replica lagging further behind
+    async with async_session(replica_max_lag(None, cursor_block_time)) as s:
+        tx_within_limit_offset = (await s.execute(query)).all()
+
+    if len(tx_within_limit_offset) > limit:
+        tx_within_limit_offset = tx_within_limit_offset[:limit]
+        last_tx_id, last_block_time = tx_within_limit_offset[-1]
+        if last_block_time is not None:
+            response.headers["X-Next-Page-Cursor"] = encode_cursor(last_block_time, last_tx_id)
 
     tx_ids_in_page = []
     max_block_time = 0
-    for tx_id, block_time in tx_within_limit_offset.all():
+    for tx_id, block_time in tx_within_limit_offset:
         tx_ids_in_page.append(tx_id)
         if block_time is not None and block_time > max_block_time:
             max_block_time = block_time
 
-    if offset and max_block_time:
+    if (offset or cursor) and max_block_time:
         delta_seconds = time.time() - int(max_block_time) / 1000
         if delta_seconds < 600:
             ttl = 8
@@ -107,7 +134,10 @@ async def get_full_transactions_for_address(
     response.headers["Cache-Control"] = f"public, max-age={ttl}"
 
     return await search_for_transactions(
-        TxSearch(transactionIds=tx_ids_in_page, acceptingBlueScores=None), fields, resolve_previous_outpoints
+        TxSearch(transactionIds=tx_ids_in_page, acceptingBlueScores=None),
+        fields,
+        resolve_previous_outpoints,
+        acceptance=None,
     )
 
 
@@ -120,6 +150,7 @@ async def get_full_transactions_for_address(
 )
 @sql_db_only
 async def get_full_transactions_for_address_page(
+    request: Request,
     response: Response,
     kaspa_address: str = Path(
         alias="kaspaAddress", description=f"Kaspa address as string e.g. {ADDRESS_EXAMPLE}", regex=REGEX_KASPA_ADDRESS
@@ -153,17 +184,12 @@ async def get_full_transactions_for_address_page(
         raise HTTPException(status_code=400, detail=f"Invalid address: {kaspa_address}")
 
     if USE_SCRIPT_FOR_ADDRESS:
-        query = (
-            select(TxScriptMapping.transaction_id, TxScriptMapping.block_time)
-            .filter(TxScriptMapping.script_public_key == script)
-            .limit(limit)
-        )
+        mapping = TxScriptMapping
+        address_filter = TxScriptMapping.script_public_key == script
     else:
-        query = (
-            select(TxAddrMapping.transaction_id, TxAddrMapping.block_time)
-            .filter(TxAddrMapping.address == kaspa_address)
-            .limit(limit)
-        )
+        mapping = TxAddrMapping
+        address_filter = TxAddrMapping.address == kaspa_address
+    query = select(mapping.transaction_id, mapping.block_time).filter(address_filter).limit(limit)
 
     response.headers["X-Page-Count"] = "0"
     if before != 0 and after != 0:
@@ -171,124 +197,99 @@ async def get_full_transactions_for_address_page(
     elif before != 0:
         if before <= GENESIS_MS:
             return []
-        if USE_SCRIPT_FOR_ADDRESS:
-            query = query.filter(TxScriptMapping.block_time < before).order_by(TxScriptMapping.block_time.desc())
-        else:
-            query = query.filter(TxAddrMapping.block_time < before).order_by(TxAddrMapping.block_time.desc())
+        query = query.filter(mapping.block_time < before).order_by(mapping.block_time.desc())
     elif after != 0:
         if after > int(time.time() * 1000) + 3600000:  # now + 1 hour
             return []
-        if USE_SCRIPT_FOR_ADDRESS:
-            query = query.filter(TxScriptMapping.block_time > after).order_by(TxScriptMapping.block_time.asc())
-        else:
-            query = query.filter(TxAddrMapping.block_time > after).order_by(TxAddrMapping.block_time.asc())
+        query = query.filter(mapping.block_time > after).order_by(mapping.block_time.asc())
     else:
-        if USE_SCRIPT_FOR_ADDRESS:
-            query = query.order_by(TxScriptMapping.block_time.desc())
-        else:
-            query = query.order_by(TxAddrMapping.block_time.desc())
+        query = query.order_by(mapping.block_time.desc())
 
     if acceptance == AcceptanceMode.accepted:
-        if USE_SCRIPT_FOR_ADDRESS:
-            query = query.join(
-                TransactionAcceptance, TxScriptMapping.transaction_id == TransactionAcceptance.transaction_id
-            )
-        else:
-            query = query.join(
-                TransactionAcceptance, TxAddrMapping.transaction_id == TransactionAcceptance.transaction_id
-            )
+        query = query.join(TransactionAcceptance, mapping.transaction_id == TransactionAcceptance.transaction_id)
 
-    async with async_session() as s:
-        tx_within_limit_before = await s.execute(query)
-
-        tx_ids_and_block_times = [(x.transaction_id, x.block_time) for x in tx_within_limit_before.all()]
-        if not tx_ids_and_block_times:
-            return []
-
-        tx_ids_and_block_times = sorted(tx_ids_and_block_times, key=lambda x: x[1], reverse=True)
-        newest_block_time = tx_ids_and_block_times[0][1]
-        oldest_block_time = tx_ids_and_block_times[-1][1]
-        tx_ids = {tx_id for tx_id, block_time in tx_ids_and_block_times}
-        if len(tx_ids_and_block_times) == limit:
-            # To avoid gaps when transactions with the same block_time are at the intersection between pages.
-            if USE_SCRIPT_FOR_ADDRESS:
-                tx_with_same_block_time = await s.execute(
-                    select(TxScriptMapping.transaction_id)
-                    .filter(TxScriptMapping.script_public_key == script)
-                    .filter(
-                        or_(
-                            TxScriptMapping.block_time == newest_block_time,
-                            TxScriptMapping.block_time == oldest_block_time,
-                        )
-                    )
-                )
-            else:
-                tx_with_same_block_time = await s.execute(
-                    select(TxAddrMapping.transaction_id)
-                    .filter(TxAddrMapping.address == kaspa_address)
-                    .filter(
-                        or_(
-                            TxAddrMapping.block_time == newest_block_time, TxAddrMapping.block_time == oldest_block_time
-                        )
-                    )
-                )
-            tx_ids.update([x for x in tx_with_same_block_time.scalars().all()])
+    # The page, its boundaries and the neighbour checks are composed into one statement (one round trip):
+    # page -> bounds (newest, oldest, count) -> boundary rows sharing the newest/oldest block_time -> has newer/older
+    page = query.cte("page")
+    bounds = (
+        select(
+            func.max(page.c.block_time).label("newest"),
+            func.min(page.c.block_time).label("oldest"),
+            func.count().label("count"),
+        )
+        .select_from(page)
+        .cte("bounds")
+    )
+    # To avoid gaps when transactions with the same block_time are at the intersection between pages.
+    boundary = (
+        select(mapping.transaction_id)
+        .filter(address_filter)
+        .filter(bounds.c.count == limit)
+        .filter(or_(mapping.block_time == bounds.c.newest, mapping.block_time == bounds.c.oldest))
+    )
+    tx_ids_in_page = union(select(page.c.transaction_id), boundary).cte("tx_ids")
+    # Check for more data before/after for pagination purposes
+    if before or after:
+        has_newer = exists().where(address_filter & (mapping.block_time > bounds.c.newest))
+    else:
+        has_newer = literal(False)
+    if not after or after >= GENESIS_MS:
+        has_older = exists().where(address_filter & (mapping.block_time < bounds.c.oldest))
+    else:
+        has_older = literal(False)
+    # Materialized, so the neighbour checks run once rather than once per transaction id
+    flags = (
+        select(bounds.c.newest, bounds.c.oldest, has_newer.label("has_newer"), has_older.label("has_older"))
+        .select_from(bounds)
+        .cte("flags")
+        .prefix_with("MATERIALIZED")
+    )
 
-        # Check for more data before/after for pagination purposes
-        if before or after:
-            if USE_SCRIPT_FOR_ADDRESS:
-                has_newer = await s.scalar(
-                    select(
-                        exists().where(
-                            (TxScriptMapping.script_public_key == script)
-                            & (TxScriptMapping.block_time > newest_block_time)
-                        )
-                    )
-                )
-            else:
-                has_newer = await s.scalar(
-                    select(
-                        exists().where(
-                            (TxAddrMapping.address == kaspa_address) & (TxAddrMapping.block_time > newest_block_time)
-                        )
-                    )
-                )
-        else:
-            has_newer = False
+    async with async_session(replica_max_lag(None, before)) as s:
+        rows = (
+            await s.execute(
+                select(tx_ids_in_page.c.transaction_id, flags).select_from(tx_ids_in_page.join(flags, true()))
+            )
+        ).all()
+    if not rows:
+        return []
 
-        if not after or after >= GENESIS_MS:
-            if USE_SCRIPT_FOR_ADDRESS:
-                has_older = await s.scalar(
-                    select(
-                        exists().where(
-                            (TxScriptMapping.script_public_key == script)
-                            & (TxScriptMapping.block_time < oldest_block_time)
-                        )
-                    )
-                )
-            else:
-                has_older = await s.scalar(
-                    select(
-                        exists().where(
-                            (TxAddrMapping.address == kaspa_address) & (TxAddrMapping.block_time < oldest_block_time)
-                        )
-                    )
-                )
-        else:
-            has_older = False
+    tx_ids = {row.transaction_id for row in rows}
+    newest_block_time, oldest_block_time = rows[0].newest, rows[0].oldest
+    has_newer, has_older = rows[0].has_newer, rows[0].has_older
 
     if has_newer:
         response.headers["X-Next-Page-After"] = str(newest_block_time)
     if has_older:
         response.headers["X-Next-Page-Before"] = str(oldest_block_time)
 
+    if before:
+        add_cache_control(None, before, response)
+    elif after and len(tx_ids) >= limit:
+        add_cache_control(None, newest_block_time, response)
+
+    if newest_block_time < time.time() * 1000 - ETAG_MIN_AGE_MS:
+        not_modified_response = not_modified(
+            request,
+            response,
+            kaspa_address,
+            limit,
+            before,
+            after,
+            fields,
+            resolve_previous_outpoints,
+            acceptance,
+            newest_block_time,
+            oldest_block_time,
+            len(tx_ids),
+            has_newer,
+            has_older,
+        )
+        if not_modified_response:
+            return not_modified_response
+
     res = await search_for_transactions(
         TxSearch(transactionIds=list(tx_ids), acceptingBlueScores=None), fields, resolve_previous_outpoints, acceptance
     )
     response.headers["X-Page-Count"] = str(len(res))
-    if before:
-        add_cache_control(None, before, response)
-    elif after and len(tx_ids) >= limit:
-        max_block_time = max((r.get("block_time") for r in res))
-        add_cache_control(None, max_block_time, response)
     return res
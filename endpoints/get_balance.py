@@ -24,6 +24,7 @@ from constants import (
 )
 from dbsession import async_session_blocks
 from endpoints import sql_db_only
+from endpoints.get_utxos import hot_addresses
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 from models.TopScript import TopScript
 from server import app, kaspad_client
@@ -46,6 +47,11 @@ async def get_balance_from_kaspa_address(
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid address: {kaspaAddress}")
 
+    hot_addresses.record_request(kaspaAddress)
+    balances = hot_addresses.get_balances([kaspaAddress])
+    if balances is not None:
+        return {"address": kaspaAddress, "balance": balances[0]}
+
     rpc_client = await kaspad_rpc_client()
     request = {"address": kaspaAddress}
     if rpc_client:
@@ -7,6 +7,7 @@ from kaspa_script_address import to_script
 from pydantic import BaseModel
 
 from constants import ADDRESS_EXAMPLE
+from endpoints.get_utxos import hot_addresses
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 from server import app, kaspad_client
 
@@ -34,6 +35,12 @@ async def get_balances_from_kaspa_addresses(body: BalanceRequest):
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid address: {kaspaAddress}")
 
+    for kaspaAddress in body.addresses:
+        hot_addresses.record_request(kaspaAddress)
+    balances = hot_addresses.get_balances(body.addresses)
+    if balances is not None:
+        return [{"address": a, "balance": b} for a, b in zip(body.addresses, balances)]
+
     rpc_client = await kaspad_rpc_client()
     request = {"addresses": body.addresses}
     if rpc_client:
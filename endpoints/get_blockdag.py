@@ -1,12 +1,26 @@
 # encoding: utf-8
+import asyncio
+import logging
+import time
 from asyncio import wait_for
 from typing import List
 
 from fastapi import HTTPException
 from pydantic import BaseModel, Field
 
+from helper.RefreshAhead import refresh_ahead
 from kaspad.KaspadRpcClient import kaspad_rpc_client
-from server import app, kaspad_client
+from server import app, kaspad_client, host_state
+
+_logger = logging.getLogger(__name__)
+
+# Latest blockdag info, virtualDaaScore is kept current by virtualDaaScoreChanged notifications
+current_blockdag_data = {}
+BLOCKDAG_REFRESH_SECONDS = 60
+BLOCKDAG_STALE_SECONDS = 10
+BLOCKDAG_FRESH_SECONDS = 2
+_last_blockdag_update = 0.0
+_last_virtual_daa_score_notification = 0.0
 
 
 class BlockdagResponse(BaseModel):
@@ -33,10 +47,15 @@ async def get_network():
 
 
 @app.get("/info/blockdag", response_model=BlockdagResponse, tags=["Kaspa network info"])
+@refresh_ahead(BLOCKDAG_FRESH_SECONDS)
 async def get_blockdag():
     """
     Get Kaspa BlockDAG information
     """
+    return await get_blockdag_from_kaspad()
+
+
+async def get_blockdag_from_kaspad():
     rpc_client = await kaspad_rpc_client()
     if rpc_client:
         info = await wait_for(rpc_client.get_block_dag_info(), 10)
@@ -47,3 +66,94 @@ async def get_blockdag():
         if "error" in resp:
             raise HTTPException(500, resp["error"])
         return resp["getBlockDagInfoResponse"]
+
+
+async def get_current_blockdag():
+    """
+    Returns the tracked blockdag info, requesting it from kaspad only if it is not kept up to date.
+    """
+    if not current_blockdag_data or time.monotonic() - _last_blockdag_update > BLOCKDAG_STALE_SECONDS:
+        set_blockdag(await get_blockdag())
+    return current_blockdag_data
+
+
+def set_blockdag(info):
+    global _last_blockdag_update
+    current_blockdag_data.update(info)
+    _last_blockdag_update = time.monotonic()
+
+
+def get_fresh_blockdag():
+    if current_blockdag_data and time.monotonic() - _last_blockdag_update <= BLOCKDAG_STALE_SECONDS:
+        return current_blockdag_data
+
+
+def set_virtual_daa_score(virtual_daa_score):
+    global _last_blockdag_update, _last_virtual_daa_score_notification
+    if current_blockdag_data:
+        current_blockdag_data["virtualDaaScore"] = str(virtual_daa_score)
+        _last_blockdag_update = _last_virtual_daa_score_notification = time.monotonic()
+
+
+def virtual_daa_score_notifications_stale():
+    return time.monotonic() - _last_virtual_daa_score_notification > BLOCKDAG_STALE_SECONDS
+
+
+async def _on_grpc_virtual_daa_score_changed(resp):
+    notification = resp.get("virtualDaaScoreChangedNotification")
+    if notification:
+        set_virtual_daa_score(notification["virtualDaaScore"])
+
+
+async def subscribe_virtual_daa_score():
+    """
+    Keeps a virtualDaaScoreChanged subscription alive, re-subscribing whenever the notifications stop arriving.
+    Only the worker polling for the host subscribes, the others get the blockdag info from the shared host state.
+    """
+    loop = asyncio.get_running_loop()
+
+    def on_wrpc_virtual_daa_score_changed(event, *args):
+        data = event.get("data", event) if isinstance(event, dict) else {}
+        virtual_daa_score = data.get("virtualDaaScore")
+        if virtual_daa_score is not None:
+            # wrpc callbacks are not invoked on the event loop
+            loop.call_soon_threadsafe(set_virtual_daa_score, virtual_daa_score)
+
+    listener_added = False
+    while True:
+        if not host_state.is_leader:
+            await asyncio.sleep(BLOCKDAG_STALE_SECONDS)
+            continue
+        try:
+            rpc_client = await kaspad_rpc_client()
+            if rpc_client:
+                if virtual_daa_score_notifications_stale() and rpc_client.is_connected:
+                    if not listener_added:
+                        rpc_client.add_event_listener("virtual-daa-score-changed", on_wrpc_virtual_daa_score_changed)
+                        listener_added = True
+                    await rpc_client.subscribe_virtual_daa_score_changed()
+                    _logger.info("Subscribed to virtual daa score changes (wrpc)")
+            elif kaspad_client.kaspads:
+                _logger.info("Subscribing to virtual daa score changes (grpc)")
+                await kaspad_client.notify(
+                    "notifyVirtualDaaScoreChangedRequest", None, _on_grpc_virtual_daa_score_changed
+                )
+        except Exception as e:
+            _logger.warning(f"Virtual daa score subscription failed: {e}")
+        await asyncio.sleep(BLOCKDAG_STALE_SECONDS)
+
+
+@app.on_event("startup")
+async def update_blockdag():
+    async def loop():
+        while True:
+            if host_state.is_leader:
+                try:
+                    set_blockdag(await get_blockdag_from_kaspad())
+                except Exception as e:
+                    _logger.warning(f"Error updating blockdag info: {e}")
+            await asyncio.sleep(BLOCKDAG_REFRESH_SECONDS)
+
+    host_state.share("blockdag", get_fresh_blockdag, set_blockdag, max_age=BLOCKDAG_STALE_SECONDS)
+    asyncio.create_task(loop())
+    asyncio.create_task(subscribe_virtual_daa_score())
@@ -1,7 +1,7 @@
 # encoding: utf-8
 from pydantic import BaseModel
 
-from endpoints.get_blockdag import get_blockdag
+from endpoints.get_blockdag import get_current_blockdag
 from helper.deflationary_table import calc_block_reward
 from server import app
 
@@ -15,7 +15,7 @@ async def get_blockreward(stringOnly: bool = False):
     """
     Returns the current blockreward in KAS/block
     """
-    bdi = await get_blockdag()
+    bdi = await get_current_blockdag()
     daa_score = int(bdi["virtualDaaScore"])
     reward_info = calc_block_reward(daa_score)
     reward = reward_info["current"]
@@ -1,20 +1,31 @@
 # encoding: utf-8
+import asyncio
 import logging
 import os
 from asyncio import wait_for
 from typing import List, Optional
 
 from fastapi import Query, Path, HTTPException
-from fastapi import Response
+from fastapi import Request, Response
 from pydantic import BaseModel
 from sqlalchemy import select, exists, func
 
-from constants import BPS
+from constants import (
+    BPS,
+    RECENT_BLOCKS_MINUTES,
+    RECENT_BLOCKS_MAX_MB,
+    BLOCK_CACHE_MAX_MB,
+    BLOCK_CACHE_MIN_DEPTH,
+    NEGATIVE_CACHE_CAPACITY,
+)
 from dbsession import async_session, async_session_blocks
 from endpoints.get_virtual_chain_blue_score import current_blue_score_data
 from helper.difficulty_calculation import bits_to_difficulty
+from helper.ByteLRUCache import ByteLRUCache
+from helper.NegativeCache import NegativeCache
+from helper.RecentBlocks import RecentBlocks
 from helper.mining_address import get_miner_payload_from_block, retrieve_miner_info_from_payload
-from helper.utils import add_cache_control
+from helper.utils import add_cache_control, not_modified
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 from models.Block import Block
 from models.BlockParent import BlockParent
@@ -28,6 +39,12 @@ _logger = logging.getLogger(__name__)
 
 IS_SQL_DB_CONFIGURED = os.getenv("SQL_URI") is not None
 
+recent_blocks = RecentBlocks(RECENT_BLOCKS_MINUTES * 60, RECENT_BLOCKS_MAX_MB * 1024 * 1024)
+# Blocks deep enough below the sink to no longer change, keyed by (source, hash, includeTransactions)
+block_cache = ByteLRUCache("blocks", BLOCK_CACHE_MAX_MB * 1024 * 1024)
+# Block ids recently not found anywhere, for as long as the 404 may be cached by clients
+unknown_blocks = NegativeCache("unknown-blocks", NEGATIVE_CACHE_CAPACITY, ttl=8)
+
 
 class VerboseDataModel(BaseModel):
     hash: str = "18c7afdf8f447ca06adb8b4946dc45f5feb1188c7d177da6094dfbc760eca699"
@@ -133,6 +150,7 @@ class BlockResponse(BaseModel):
 
 @app.get("/blocks/{blockId}", response_model=BlockModel, tags=["Kaspa blocks"])
 async def get_block(
+    request: Request,
     response: Response,
     blockId: str = Path(regex="[a-f0-9]{64}"),
     includeTransactions: bool = True,
@@ -141,8 +159,13 @@ async def get_block(
     """
     Get block information for a given block id
     """
+    if blockId not in recent_blocks and blockId in unknown_blocks:
+        raise HTTPException(status_code=404, detail="Block not found", headers={"Cache-Control": "public, max-age=8"})
+
+    source = "kaspad"
     block = await get_block_from_kaspad(blockId, includeTransactions, includeColor)
     if not block and IS_SQL_DB_CONFIGURED:
+        source = "db"
         response.headers["X-Data-Source"] = "Database"
         block = await get_block_from_db(blockId, includeTransactions)
         if block:
@@ -162,9 +185,25 @@ async def get_block(
         if not includeTransactions:
             block["transactions"] = None
     else:
+        unknown_blocks.add(blockId)
         raise HTTPException(status_code=404, detail="Block not found", headers={"Cache-Control": "public, max-age=8"})
 
     add_cache_control(block.get("header", {}).get("blueScore"), block.get("header", {}).get("timestamp"), response)
+    verbose_data = block.get("verboseData", {})
+    # kaspad and the db don't represent a block identically, like the block_cache keys the ETag includes the source
+    not_modified_response = not_modified(
+        request,
+        response,
+        source,
+        blockId,
+        includeTransactions,
+        includeColor,
+        verbose_data.get("childrenHashes"),
+        verbose_data.get("isChainBlock"),
+        (block.get("extra") or {}).get("color"),
+    )
+    if not_modified_response:
+        return not_modified_response
     return block
 
 
@@ -191,7 +230,7 @@ async def get_blocks(
         except Exception:
             return {"blockHashes": [], "blocks": []}
     else:
-        resp = await kaspad_client.request("getBlocksRequest", request)
+        resp = await kaspad_client.request("getBlocksRequest", request, timeout=60)
         return resp["getBlocksResponse"]
 
 
@@ -254,7 +293,10 @@ async def get_blocks_from_bluescore(
             block_hashes = (await s.execute(select(Block.hash).where(Block.blue_score == blueScore))).scalars().all()
 
         if not block_hashes:
-            return []
+            # The newest blocks may not be indexed yet
+            block_hashes = recent_blocks.get_block_hashes_by_blue_score(blueScore)
+            if not block_hashes:
+                return []
 
         result = []
         for block_hash in block_hashes:
@@ -270,15 +312,51 @@ async def get_blocks_from_bluescore(
 
     result = []
     for block, is_chain_block, parents, children, transaction_ids in blocks:
+        cache_key = ("db", block.hash, includeTransactions)
+        cached_block = block_cache.get(cache_key)
+        if cached_block is not None:
+            result.append(cached_block)
+            continue
         transactions = None
         if includeTransactions and transaction_ids:
             transactions = await get_transactions(block.hash, transaction_ids)
-        result.append(map_block_from_db(block, is_chain_block, parents, children, transaction_ids, transactions))
+        mapped_block = map_block_from_db(block, is_chain_block, parents, children, transaction_ids, transactions)
+        cache_block(cache_key, mapped_block)
+        result.append(mapped_block)
 
     return result
 
 
 async def get_block_from_kaspad(block_hash, include_transactions, include_color):
+    block = recent_blocks.get_block(block_hash, include_transactions)
+    if block:
+        logging.debug(f"Found block in recent blocks: {block_hash}")
+    else:
+        block = await get_block_from_kaspad_rpc(block_hash, include_transactions)
+    if not block.get("verboseData", {}).get("isHeaderOnly", True):
+        block["extra"] = {}
+        if include_color:
+            if block["verboseData"]["isChainBlock"]:
+                block["extra"]["color"] = "blue"
+            else:
+                block["extra"]["color"] = await get_block_color_from_kaspad(block["verboseData"]["hash"])
+        return block
+
+
+def cache_block(key, block):
+    blue_score = block.get("header", {}).get("blueScore") if block else None
+    current_blue_score = current_blue_score_data["blue_score"]
+    if blue_score is not None and current_blue_score > 0:
+        if current_blue_score - int(blue_score) >= BLOCK_CACHE_MIN_DEPTH:
+            block_cache.put(key, block)
+
+
+async def get_block_from_kaspad_rpc(block_hash, include_transactions):
+    cache_key = ("kaspad", block_hash, include_transactions)
+    block = block_cache.get(cache_key)
+    if block is not None:
+        return dict(block)  # callers modify the top level
+
     rpc_client = await kaspad_rpc_client()
     request = {"hash": block_hash, "includeTransactions": include_transactions}
     if rpc_client:
@@ -293,16 +371,21 @@ async def get_block_from_kaspad(block_hash, include_transactions, include_color)
         block = resp.get("getBlockResponse", {}).get("block", {})
         logging.debug(f"Found block in kaspad (grpc): {block_hash}")
     if not block.get("verboseData", {}).get("isHeaderOnly", True):
-        block["extra"] = {}
-        if include_color:
-            if block["verboseData"]["isChainBlock"]:
-                block["extra"]["color"] = "blue"
-            else:
-                block["extra"]["color"] = await get_block_color_from_kaspad(block["verboseData"]["hash"])
-        return block
+        cache_block(cache_key, block)
+    return dict(block)
 
 
 async def get_block_from_db(block_hash, include_transactions):
+    cache_key = ("db", block_hash, include_transactions)
+    block = block_cache.get(cache_key)
+    if block is None:
+        block = await get_uncached_block_from_db(block_hash, include_transactions)
+        if block:
+            cache_block(cache_key, block)
+    return dict(block) if block else None
+
+
+async def get_uncached_block_from_db(block_hash, include_transactions):
     async with async_session_blocks() as s:
         result = (await s.execute(block_join_query().where(Block.hash == block_hash).limit(1))).first()
 
@@ -373,6 +456,48 @@ async def get_block_color_from_db(block):
     return None
 
 
+async def subscribe_blocks_added():
+    """
+    Keeps a blockAdded subscription alive, feeding the recent blocks buffer.
+    """
+    loop = asyncio.get_running_loop()
+    listener_added = False
+
+    def on_wrpc_block_added(event, *args):
+        data = event.get("data", event) if isinstance(event, dict) else {}
+        if data.get("block"):
+            # wrpc callbacks are not invoked on the event loop
+            loop.call_soon_threadsafe(recent_blocks.add, convert_to_legacy_block(data["block"]))
+
+    async def on_grpc_block_added(resp):
+        notification = resp.get("blockAddedNotification")
+        if notification:
+            recent_blocks.add(notification["block"])
+
+    while True:
+        try:
+            rpc_client = await kaspad_rpc_client()
+            if rpc_client:
+                if recent_blocks.is_stale(10) and rpc_client.is_connected:
+                    if not listener_added:
+                        rpc_client.add_event_listener("block-added", on_wrpc_block_added)
+                        listener_added = True
+                    await rpc_client.subscribe_block_added()
+                    _logger.info("Subscribed to added blocks (wrpc)")
+            elif kaspad_client.kaspads:
+                _logger.info("Subscribing to added blocks (grpc)")
+                await kaspad_client.notify("notifyBlockAddedRequest", None, on_grpc_block_added)
+        except Exception as e:
+            _logger.warning(f"Block added subscription failed: {e}")
+        await asyncio.sleep(10)
+
+
+@app.on_event("startup")
+async def start_recent_blocks():
+    if RECENT_BLOCKS_MINUTES > 0:
+        asyncio.create_task(subscribe_blocks_added())
+
+
 def map_block_from_db(block, is_chain_block, parents, children, transaction_ids, transactions):
     return {
         "header": {
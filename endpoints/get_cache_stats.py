@@ -0,0 +1,14 @@
+# encoding: utf-8
+from starlette.responses import Response
+
+from helper.ByteLRUCache import caches
+from server import app
+
+
+@app.get("/info/cache-stats", include_in_schema=False)
+async def get_cache_stats(response: Response):
+    """
+    Hit/miss/eviction statistics of the in-process caches
+    """
+    response.headers["Cache-Control"] = "no-cache"
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -6,16 +6,21 @@ from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
 from constants import MAX_SUPPLY_KAS, SOMPI_PER_KAS
+from helper.RefreshAhead import refresh_ahead
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 from server import app, kaspad_client
 
 
+COINSUPPLY_FRESH_SECONDS = 10
+
+
 class CoinSupplyResponse(BaseModel):
     circulatingSupply: str = "1000900697580640180"
     maxSupply: str = "2900000000000000000"
 
 
 @app.get("/info/coinsupply", response_model=CoinSupplyResponse, tags=["Kaspa network info"])
+@refresh_ahead(COINSUPPLY_FRESH_SECONDS)
 async def get_coinsupply():
     """
     Get $KAS coin supply information
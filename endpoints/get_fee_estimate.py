@@ -4,11 +4,15 @@ from asyncio import wait_for
 from fastapi import HTTPException
 from typing import List
 
+from helper.RefreshAhead import refresh_ahead
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 from server import app, kaspad_client
 from pydantic import BaseModel
 
 
+FEE_ESTIMATE_FRESH_SECONDS = 2
+
+
 class FeeEstimateBucket(BaseModel):
     feerate: int = 1
     estimatedSeconds: float = 0.004
@@ -21,6 +25,7 @@ class FeeEstimateResponse(BaseModel):
 
 
 @app.get("/info/fee-estimate", response_model=FeeEstimateResponse, tags=["Kaspa network info"])
+@refresh_ahead(FEE_ESTIMATE_FRESH_SECONDS)
 async def get_fee_estimate():
     """
     Get fee estimate from Kaspad.
@@ -5,7 +5,7 @@ from pydantic import BaseModel
 from starlette.responses import PlainTextResponse
 
 from constants import BPS
-from endpoints.get_blockdag import get_blockdag
+from endpoints.get_blockdag import get_current_blockdag
 from helper.deflationary_table import calc_block_reward
 from server import app
 
@@ -21,7 +21,7 @@ async def get_halving(field: str | None = None):
     """
     Returns information about chromatic halving
     """
-    bdi = await get_blockdag()
+    bdi = await get_current_blockdag()
     daa_score = int(bdi["virtualDaaScore"])
 
     reward_info = calc_block_reward(daa_score)
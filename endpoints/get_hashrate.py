@@ -9,15 +9,18 @@ from sqlalchemy import select
 from constants import BPS
 from dbsession import async_session_blocks
 from endpoints import sql_db_only
-from endpoints.get_blockdag import get_blockdag
+from endpoints.get_blockdag import get_blockdag, get_current_blockdag
 from endpoints.get_blocks import get_block_from_kaspad
 from helper import KeyValueStore
+from helper.RefreshAhead import refresh_ahead
 from helper.difficulty_calculation import bits_to_difficulty
 from models.Block import Block
 from server import app
 
 _logger = logging.getLogger(__name__)
 
+HASHRATE_FRESH_SECONDS = 10
+
 
 class BlockHeader(BaseModel):
     hash: str = "e6641454e16cff4f232b899564eeaa6e480b66069d87bee6a2b2476e63fcd887"
@@ -37,11 +40,12 @@ class MaxHashrateResponse(BaseModel):
 
 
 @app.get("/info/hashrate", response_model=HashrateResponse | str, tags=["Kaspa network info"])
+@refresh_ahead(HASHRATE_FRESH_SECONDS)
 async def get_hashrate(stringOnly: bool = False):
     """
     Returns the current hashrate for Kaspa network in TH/s.
     """
-    bdi = await get_blockdag()
+    bdi = await get_current_blockdag()
     hashrate = bdi["difficulty"] * 2 * BPS
     hashrate_in_th = hashrate / 1_000_000_000_000
 
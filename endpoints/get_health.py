@@ -2,7 +2,6 @@
 import hashlib
 import logging
 import time
-from asyncio import wait_for
 from typing import List
 
 from pydantic import BaseModel
@@ -82,10 +81,10 @@ async def health_state():
     except Exception:
         db_check_status = DBCheckStatus(isSynced=False)
 
-    await kaspad_client.initialize_all()
     kaspads = []
 
-    rpc_client = await kaspad_rpc_client()
+    # Only the state kept up to date by the health monitor, a request never waits for a reconnect
+    rpc_client = await kaspad_rpc_client(connect=False)
     if rpc_client:
         kaspad = {
             "kaspadHost": "wrpc",
@@ -93,12 +92,11 @@ async def health_state():
             "isSynced": False,
         }
         try:
-            rpc_client_info = await wait_for(rpc_client.get_info(), 10)
-            kaspad["serverVersion"] = rpc_client_info["serverVersion"]
-            kaspad["isUtxoIndexed"] = rpc_client_info["isUtxoIndexed"]
-            kaspad["isSynced"] = rpc_client_info["isSynced"]
-            kaspad["p2pId"] = hashlib.sha256(rpc_client_info["p2pId"].encode()).hexdigest()
-            kaspad["blueScore"] = (await wait_for(rpc_client.get_sink_blue_score(), 10))["blueScore"]
+            kaspad["serverVersion"] = rpc_client.server_version
+            kaspad["isUtxoIndexed"] = rpc_client.is_utxo_indexed
+            kaspad["isSynced"] = rpc_client.is_synced
+            kaspad["p2pId"] = hashlib.sha256(rpc_client.p2p_id.encode()).hexdigest()
+            kaspad["blueScore"] = current_blue_score_node
         except Exception as err:
             _logger.error("Kaspad health check failed %s", err)
         kaspads.append(kaspad)
@@ -5,10 +5,14 @@ from asyncio import wait_for
 from fastapi import HTTPException
 from pydantic import BaseModel
 
+from helper.RefreshAhead import refresh_ahead
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 from server import app, kaspad_client
 
 
+KASPAD_INFO_FRESH_SECONDS = 10
+
+
 class KaspadInfoResponse(BaseModel):
     mempoolSize: str = "1"
     serverVersion: str = "0.12.2"
@@ -18,6 +22,7 @@ class KaspadInfoResponse(BaseModel):
 
 
 @app.get("/info/kaspad", response_model=KaspadInfoResponse, tags=["Kaspa network info"])
+@refresh_ahead(KASPAD_INFO_FRESH_SECONDS)
 async def get_kaspad_info():
     """
     Get some information for kaspad instance, which is currently connected.
@@ -4,14 +4,19 @@ from pydantic import BaseModel
 
 from endpoints.get_circulating_supply import get_coinsupply
 from helper import get_kas_price
+from helper.RefreshAhead import refresh_ahead
 from server import app
 
 
+MARKETCAP_FRESH_SECONDS = 60
+
+
 class MarketCapResponse(BaseModel):
     marketcap: int = 12000132
 
 
 @app.get("/info/marketcap", response_model=MarketCapResponse | str, tags=["Kaspa network info"])
+@refresh_ahead(MARKETCAP_FRESH_SECONDS)
 async def get_marketcap(stringOnly: bool = False):
     """
     Get $KAS price and market cap. Price info is from coingecko.com
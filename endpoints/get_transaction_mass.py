@@ -42,7 +42,7 @@ async def calculate_transaction_mass(tx: SubmitTxModel):
 
     txs = list(
         await search_for_transactions(
-            TxSearch(transactionIds=list([x.transactionId for x in previous_outpoints])), "", False
+            TxSearch(transactionIds=list([x.transactionId for x in previous_outpoints])), "", False, acceptance=None
         )
     )
 
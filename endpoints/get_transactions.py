@@ -1,4 +1,5 @@
 # encoding: utf-8
+import asyncio
 import logging
 from collections import defaultdict
 from enum import Enum
@@ -9,23 +10,47 @@ from kaspa_script_address import to_address
 from pydantic import BaseModel, Field
 from sqlalchemy import exists, text
 from sqlalchemy.future import select
+from starlette.requests import Request
 from starlette.responses import Response
 
-from constants import TX_SEARCH_ID_LIMIT, TX_SEARCH_BS_LIMIT, PREV_OUT_RESOLVED, ADDRESS_PREFIX
+from constants import (
+    TX_SEARCH_ID_LIMIT,
+    TX_SEARCH_BS_LIMIT,
+    PREV_OUT_RESOLVED,
+    ADDRESS_PREFIX,
+    TX_CACHE_MAX_MB,
+    TX_CACHE_MIN_DEPTH,
+    OUTPOINT_CACHE_MAX_MB,
+    NEGATIVE_CACHE_CAPACITY,
+)
 from dbsession import async_session, async_session_blocks
 from endpoints import filter_fields, sql_db_only
-from endpoints.get_blocks import get_block_from_kaspad
+from endpoints.get_blocks import get_block_from_kaspad, recent_blocks
+from endpoints.get_virtual_chain_blue_score import current_blue_score_data
+from helper.ByteLRUCache import ByteLRUCache
+from helper.NegativeCache import NegativeCache
 from helper.PublicKeyType import get_public_key_type
-from helper.utils import add_cache_control
+from helper.utils import add_cache_control, not_modified
 from models.Block import Block
 from models.BlockTransaction import BlockTransaction
-from models.Transaction import Transaction
+from models.Transaction import (
+    transactions_by_ids,
+    transactions_with_acceptance_by_ids,
+    transactions_by_accepting_blocks,
+)
 from models.TransactionAcceptance import TransactionAcceptance
 from models.TransactionTypes import bytea_to_hex
 from server import app
 
 _logger = logging.getLogger(__name__)
 
+# Transactions accepted deep enough below the sink to no longer change, one (source, transaction) per request variant
+transaction_cache = ByteLRUCache("transactions", TX_CACHE_MAX_MB * 1024 * 1024)
+# Outputs spent by previous outpoints, (transaction id, index) -> (amount, script_public_key, address), never change
+outpoint_cache = ByteLRUCache("outpoints", OUTPOINT_CACHE_MAX_MB * 1024 * 1024)
+# Transaction ids (and block hash hints) recently not found, for as long as the 404 may be cached by clients
+unknown_transactions = NegativeCache("unknown-transactions", NEGATIVE_CACHE_CAPACITY, ttl=3)
+
 DESC_RESOLVE_PARAM = (
     "Use this parameter if you want to fetch the TransactionInput previous outpoint details."
     " Light fetches only the address and amount. Full fetches the whole TransactionOutput and "
@@ -128,6 +153,7 @@ class AcceptanceMode(str, Enum):
 )
 @sql_db_only
 async def get_transaction(
+    request: Request,
     response: Response,
     transaction_id: str = Path(regex="[a-f0-9]{64}"),
     blockHash: str = Query(None, description="Specify a containing block (if known) for faster lookup"),
@@ -140,90 +166,161 @@ async def get_transaction(
     """
     Get details for a given transaction id
     """
-    async with async_session_blocks() as session_blocks:
-        async with async_session() as session:
-            transaction = None
-            if blockHash:
-                block_hashes = [blockHash]
-            else:
-                block_hashes = await session_blocks.execute(
-                    select(BlockTransaction.block_hash).filter(BlockTransaction.transaction_id == transaction_id)
-                )
-                block_hashes = block_hashes.scalars().all()
-
-            if block_hashes:
-                transaction = await get_transaction_from_kaspad(block_hashes, transaction_id, inputs, outputs)
-                if transaction and transaction["inputs"] and inputs:
-                    transaction["inputs"] = (
-                        await resolve_inputs_from_db(transaction["inputs"], resolve_previous_outpoints, False)
-                    ).get(transaction_id)
-
-            if not transaction:
-                tx = await session.execute(select(Transaction).filter(Transaction.transaction_id == transaction_id))
-                tx = tx.first()
-
-                if tx:
-                    logging.debug(f"Found transaction {transaction_id} in database")
-                    transaction = {
-                        "subnetwork_id": tx.Transaction.subnetwork_id,
-                        "transaction_id": tx.Transaction.transaction_id,
-                        "hash": tx.Transaction.hash,
-                        "mass": tx.Transaction.mass,
-                        "payload": tx.Transaction.payload,
-                        "block_hash": block_hashes,
-                        "block_time": tx.Transaction.block_time,
-                        "version": tx.Transaction.version or 0,
-                        "inputs": [vars(i) for i in tx.Transaction.inputs]
-                        if tx.Transaction.inputs and inputs
-                        else None,
-                        "outputs": [vars(o) for o in tx.Transaction.outputs]
-                        if tx.Transaction.outputs and outputs
-                        else None,
-                    }
-                    if transaction["inputs"]:
-                        transaction["inputs"] = (
-                            await resolve_inputs_from_db(transaction["inputs"], resolve_previous_outpoints)
-                        ).get(transaction_id)
-
-            if transaction:
-                accepted_transaction_id, accepting_block_hash = (
-                    await session.execute(
-                        select(
-                            TransactionAcceptance.transaction_id,
-                            TransactionAcceptance.block_hash,
-                        ).filter(TransactionAcceptance.transaction_id == transaction_id)
-                    )
-                ).one_or_none() or (None, None)
-                transaction["is_accepted"] = accepted_transaction_id is not None
-
-                if accepting_block_hash:
-                    accepting_block_blue_score, accepting_block_time = (
-                        await session_blocks.execute(
-                            select(
-                                Block.blue_score,
-                                Block.timestamp,
-                            ).filter(Block.hash == accepting_block_hash)
-                        )
-                    ).one_or_none() or (None, None)
-                    transaction["accepting_block_hash"] = accepting_block_hash
-                    transaction["accepting_block_blue_score"] = accepting_block_blue_score
-                    transaction["accepting_block_time"] = accepting_block_time
-                    if not accepting_block_blue_score:
-                        accepting_block = await get_block_from_kaspad(accepting_block_hash, False, False)
-                        accepting_block_header = accepting_block.get("header") if accepting_block else None
-                        if accepting_block_header:
-                            transaction["accepting_block_blue_score"] = accepting_block_header.get("blueScore")
-                            transaction["accepting_block_time"] = accepting_block_header.get("timestamp")
+    cache_key = (transaction_id, blockHash, inputs, outputs, resolve_previous_outpoints)
+    cached = transaction_cache.get(cache_key)
+    if cached is not None:
+        source, transaction = cached
+        return transaction_response(request, response, cache_key, source, transaction)
+
+    unknown_key = f"{transaction_id}:{blockHash}" if blockHash else transaction_id
+    if not recent_blocks.get_transaction_block_hashes(transaction_id) and unknown_key in unknown_transactions:
+        raise HTTPException(
+            status_code=404, detail="Transaction not found", headers={"Cache-Control": "public, max-age=3"}
+        )
 
+    # The acceptance row doesn't depend on where the transaction itself is found, so both are looked up concurrently.
+    # The accepting block is only looked up once the transaction is known to exist.
+    (source, transaction), accepting_block_hash = await asyncio.gather(
+        get_transaction_body(transaction_id, blockHash, inputs, outputs, resolve_previous_outpoints),
+        get_accepting_block_hash(transaction_id),
+    )
     if transaction:
-        add_cache_control(transaction.get("accepting_block_blue_score"), transaction.get("block_time"), response)
-        return transaction
+        transaction.update(await get_acceptance(accepting_block_hash))
+
+    if transaction:
+        if is_final_transaction(transaction):
+            transaction_cache.put(cache_key, (source, transaction))
+        return transaction_response(request, response, cache_key, source, transaction)
     else:
+        unknown_transactions.add(unknown_key)
         raise HTTPException(
             status_code=404, detail="Transaction not found", headers={"Cache-Control": "public, max-age=3"}
         )
 
 
+async def get_transaction_body(transaction_id, block_hash, inputs, outputs, resolve_previous_outpoints):
+    """
+    Returns (source, transaction), source being kaspad or db, or (None, None) if not found.
+    """
+    if block_hash:
+        block_hashes = [block_hash]
+    else:
+        block_hashes = recent_blocks.get_transaction_block_hashes(transaction_id)
+
+    if not block_hashes:
+        async with async_session_blocks() as session_blocks:
+            block_hashes = await session_blocks.execute(
+                select(BlockTransaction.block_hash).filter(BlockTransaction.transaction_id == transaction_id)
+            )
+            block_hashes = block_hashes.scalars().all()
+
+    if block_hashes:
+        transaction = await get_transaction_from_kaspad(block_hashes, transaction_id, inputs, outputs)
+        if transaction:
+            if transaction["inputs"] and inputs:
+                transaction["inputs"] = (
+                    await resolve_inputs_from_db(transaction["inputs"], resolve_previous_outpoints, False)
+                ).get(transaction_id)
+            return "kaspad", transaction
+
+    tx = next(iter(await transactions_by_ids([transaction_id])), None)
+    if not tx:
+        return None, None
+
+    logging.debug(f"Found transaction {transaction_id} in database")
+    transaction = {
+        "subnetwork_id": tx["subnetwork_id"],
+        "transaction_id": tx["transaction_id"],
+        "hash": tx["hash"],
+        "mass": tx["mass"],
+        "payload": tx["payload"],
+        "block_hash": block_hashes,
+        "block_time": tx["block_time"],
+        "version": tx["version"] or 0,
+        "inputs": tx["inputs"] if tx["inputs"] and inputs else None,
+        "outputs": tx["outputs"] if tx["outputs"] and outputs else None,
+    }
+    if transaction["inputs"]:
+        transaction["inputs"] = (await resolve_inputs_from_db(transaction["inputs"], resolve_previous_outpoints)).get(
+            transaction_id
+        )
+    return "db", transaction
+
+
+async def get_accepting_block_hash(transaction_id):
+    """
+    Returns the accepting block hash, "" if accepted without a known block and None if not accepted.
+    """
+    async with async_session() as session:
+        accepted_transaction_id, accepting_block_hash = (
+            await session.execute(
+                select(
+                    TransactionAcceptance.transaction_id,
+                    TransactionAcceptance.block_hash,
+                ).filter(TransactionAcceptance.transaction_id == transaction_id)
+            )
+        ).one_or_none() or (None, None)
+    if accepted_transaction_id is not None:
+        return accepting_block_hash or ""
+
+
+async def get_acceptance(accepting_block_hash):
+    acceptance = {"is_accepted": accepting_block_hash is not None}
+    if not accepting_block_hash:
+        return acceptance
+
+    async with async_session_blocks() as session_blocks:
+        accepting_block_blue_score, accepting_block_time = (
+            await session_blocks.execute(
+                select(
+                    Block.blue_score,
+                    Block.timestamp,
+                ).filter(Block.hash == accepting_block_hash)
+            )
+        ).one_or_none() or (None, None)
+    acceptance["accepting_block_hash"] = accepting_block_hash
+    acceptance["accepting_block_blue_score"] = accepting_block_blue_score
+    acceptance["accepting_block_time"] = accepting_block_time
+    if not accepting_block_blue_score:
+        accepting_block = await get_block_from_kaspad(accepting_block_hash, False, False)
+        accepting_block_header = accepting_block.get("header") if accepting_block else None
+        if accepting_block_header:
+            acceptance["accepting_block_blue_score"] = accepting_block_header.get("blueScore")
+            acceptance["accepting_block_time"] = accepting_block_header.get("timestamp")
+    return acceptance
+
+
+def transaction_response(request, response, cache_key, source, transaction):
+    add_cache_control(transaction.get("accepting_block_blue_score"), transaction.get("block_time"), response)
+    # kaspad and the db don't represent a transaction identically and the accepting block details may be filled in
+    # later, both are part of the ETag
+    not_modified_response = not_modified(
+        request,
+        response,
+        source,
+        cache_key,
+        transaction.get("block_hash"),
+        transaction.get("is_accepted"),
+        transaction.get("accepting_block_hash"),
+        transaction.get("accepting_block_blue_score"),
+        transaction.get("accepting_block_time"),
+    )
+    if not_modified_response:
+        return not_modified_response
+    return transaction
+
+
+def is_final_transaction(transaction):
+    accepting_block_blue_score = transaction.get("accepting_block_blue_score")
+    current_blue_score = current_blue_score_data["blue_score"]
+    return (
+        transaction.get("is_accepted")
+        and accepting_block_blue_score is not None
+        and current_blue_score > 0
+        and current_blue_score - int(accepting_block_blue_score) >= TX_CACHE_MIN_DEPTH
+    )
+
+
 @app.post(
     "/transactions/search", response_model=List[TxModel], tags=["Kaspa transactions"], response_model_exclude_unset=True
 )
@@ -262,102 +359,87 @@ async def search_for_transactions(
 
     fields = fields.split(",") if fields else []
 
-    async with async_session() as session:
-        async with async_session_blocks() as session_blocks:
-            tx_query = (
+    async with async_session_blocks() as session_blocks:
+        if accepting_blue_score_gte:
+            tx_acceptances = await session_blocks.execute(
                 select(
-                    Transaction,
-                    TransactionAcceptance.transaction_id.label("accepted_transaction_id"),
-                    TransactionAcceptance.block_hash.label("accepting_block_hash"),
+                    Block.hash.label("accepting_block_hash"),
+                    Block.blue_score.label("accepting_block_blue_score"),
+                    Block.timestamp.label("accepting_block_time"),
                 )
-                .outerjoin(TransactionAcceptance, Transaction.transaction_id == TransactionAcceptance.transaction_id)
-                .order_by(Transaction.block_time.desc())
+                .filter(exists().where(TransactionAcceptance.block_hash == Block.hash))  # Only chain blocks
+                .filter(Block.blue_score >= accepting_blue_score_gte)
+                .filter(Block.blue_score < accepting_blue_score_lt)
             )
+            tx_acceptances = {row.accepting_block_hash: row for row in tx_acceptances.all()}
+            if not tx_acceptances:
+                return []
+            tx_list = await transactions_by_accepting_blocks(tx_acceptances.keys())
+            transaction_ids = [tx["transaction_id"] for tx in tx_list]
+        else:
+            tx_list = await transactions_with_acceptance_by_ids(
+                transaction_ids, acceptance.value if acceptance else None
+            )
+            if not tx_list:
+                return []
+            accepting_block_hashes = [
+                tx["accepting_block_hash"] for tx in tx_list if tx["accepting_block_hash"] is not None
+            ]
+            tx_acceptances = await session_blocks.execute(
+                select(
+                    Block.hash.label("accepting_block_hash"),
+                    Block.blue_score.label("accepting_block_blue_score"),
+                    Block.timestamp.label("accepting_block_time"),
+                ).filter(Block.hash.in_(accepting_block_hashes))
+            )
+            tx_acceptances = {row.accepting_block_hash: row for row in tx_acceptances.all()}
 
-            if accepting_blue_score_gte:
-                tx_acceptances = await session_blocks.execute(
-                    select(
-                        Block.hash.label("accepting_block_hash"),
-                        Block.blue_score.label("accepting_block_blue_score"),
-                        Block.timestamp.label("accepting_block_time"),
-                    )
-                    .filter(exists().where(TransactionAcceptance.block_hash == Block.hash))  # Only chain blocks
-                    .filter(Block.blue_score >= accepting_blue_score_gte)
-                    .filter(Block.blue_score < accepting_blue_score_lt)
-                )
-                tx_acceptances = {row.accepting_block_hash: row for row in tx_acceptances.all()}
-                if not tx_acceptances:
-                    return []
-                tx_query = tx_query.filter(TransactionAcceptance.block_hash.in_(tx_acceptances.keys()))
-                tx_list = (await session.execute(tx_query)).all()
-                transaction_ids = [row.Transaction.transaction_id for row in tx_list]
-            else:
-                tx_query = tx_query.filter(Transaction.transaction_id.in_(transaction_ids))
-                if acceptance == AcceptanceMode.accepted:
-                    tx_query = tx_query.filter(TransactionAcceptance.transaction_id.is_not(None))
-                elif acceptance == AcceptanceMode.rejected:
-                    tx_query = tx_query.filter(TransactionAcceptance.transaction_id.is_(None))
-                tx_list = (await session.execute(tx_query)).all()
-                if not tx_list:
-                    return []
-                accepting_block_hashes = [
-                    row.accepting_block_hash for row in tx_list if row.accepting_block_hash is not None
-                ]
-                tx_acceptances = await session_blocks.execute(
-                    select(
-                        Block.hash.label("accepting_block_hash"),
-                        Block.blue_score.label("accepting_block_blue_score"),
-                        Block.timestamp.label("accepting_block_time"),
-                    ).filter(Block.hash.in_(accepting_block_hashes))
-                )
-                tx_acceptances = {row.accepting_block_hash: row for row in tx_acceptances.all()}
-
+    # Independent lookups on their own sessions, sent concurrently rather than one after the other
     if not fields or "inputs" in fields:
-        tx_inputs = await resolve_inputs_from_db(
-            [vars(i) for tx in tx_list for i in (tx.Transaction.inputs or []) if i], resolve_previous_outpoints
+        tx_inputs, tx_blocks = await asyncio.gather(
+            resolve_inputs_from_db([i for tx in tx_list for i in (tx["inputs"] or [])], resolve_previous_outpoints),
+            get_tx_blocks_from_db(fields, transaction_ids),
         )
     else:
         tx_inputs = {}
-    tx_blocks = await get_tx_blocks_from_db(fields, transaction_ids)
+        tx_blocks = await get_tx_blocks_from_db(fields, transaction_ids)
 
     block_cache = {}
     results = []
     for tx in tx_list:
         accepting_block_blue_score = None
         accepting_block_time = None
-        accepting_block = tx_acceptances.get(tx.accepting_block_hash)
+        accepting_block = tx_acceptances.get(tx["accepting_block_hash"])
         if accepting_block:
             accepting_block_blue_score = accepting_block.accepting_block_blue_score
             accepting_block_time = accepting_block.accepting_block_time
         else:
-            if tx.accepting_block_hash:
-                if tx.accepting_block_hash not in block_cache:
-                    block_cache[tx.accepting_block_hash] = await get_block_from_kaspad(
-                        tx.accepting_block_hash, False, False
+            if tx["accepting_block_hash"]:
+                if tx["accepting_block_hash"] not in block_cache:
+                    block_cache[tx["accepting_block_hash"]] = await get_block_from_kaspad(
+                        tx["accepting_block_hash"], False, False
                     )
-                accepting_block = block_cache[tx.accepting_block_hash]
+                accepting_block = block_cache[tx["accepting_block_hash"]]
                 if accepting_block and accepting_block["header"]:
                     accepting_block_blue_score = accepting_block["header"]["blueScore"]
                     accepting_block_time = accepting_block["header"]["timestamp"]
 
         result = filter_fields(
             {
-                "subnetwork_id": tx.Transaction.subnetwork_id,
-                "transaction_id": tx.Transaction.transaction_id,
-                "hash": tx.Transaction.hash,
-                "mass": tx.Transaction.mass,
-                "payload": tx.Transaction.payload,
-                "block_hash": tx_blocks.get(tx.Transaction.transaction_id),
-                "block_time": tx.Transaction.block_time,
-                "version": tx.Transaction.version or 0,
-                "is_accepted": True if tx.accepted_transaction_id else False,
-                "accepting_block_hash": tx.accepting_block_hash,
+                "subnetwork_id": tx["subnetwork_id"],
+                "transaction_id": tx["transaction_id"],
+                "hash": tx["hash"],
+                "mass": tx["mass"],
+                "payload": tx["payload"],
+                "block_hash": tx_blocks.get(tx["transaction_id"]),
+                "block_time": tx["block_time"],
+                "version": tx["version"] or 0,
+                "is_accepted": tx["is_accepted"],
+                "accepting_block_hash": tx["accepting_block_hash"],
                 "accepting_block_blue_score": accepting_block_blue_score,
                 "accepting_block_time": accepting_block_time,
-                "inputs": tx_inputs.get(tx.Transaction.transaction_id) if not fields or "inputs" in fields else None,
-                "outputs": [vars(o) for o in tx.Transaction.outputs]
-                if tx.Transaction.outputs and (not fields or "outputs" in fields)
-                else None,
+                "inputs": tx_inputs.get(tx["transaction_id"]) if not fields or "inputs" in fields else None,
+                "outputs": tx["outputs"] if tx["outputs"] and (not fields or "outputs" in fields) else None,
             },
             fields,
         )
@@ -429,71 +511,40 @@ async def get_tx_blocks_from_db(fields, transaction_ids):
 
 async def resolve_inputs_from_db(inputs, resolve_previous_outpoints, prev_out_resolved=PREV_OUT_RESOLVED):
     if inputs and not prev_out_resolved and resolve_previous_outpoints != PreviousOutpointLookupMode.no:
-        tx_ids, tx_indices, prev_hashes, prev_indices = zip(
-            *[
-                (
-                    bytes.fromhex(i["transaction_id"]),
-                    i["index"],
-                    bytes.fromhex(i["previous_outpoint_hash"]),
-                    i["previous_outpoint_index"],
-                )
-                for i in inputs
-            ]
-        )
+        resolved_outputs = {}
+        missing_outpoints = set()
+        for outpoint in {(i["previous_outpoint_hash"], int(i["previous_outpoint_index"])) for i in inputs}:
+            resolved_output = outpoint_cache.get(outpoint)
+            if resolved_output is not None:
+                resolved_outputs[outpoint] = resolved_output
+            else:
+                missing_outpoints.add(outpoint)
+        outpoint_cache.count("savedRows", len(resolved_outputs))
+
+        if missing_outpoints:
+            fetched_outputs = await resolve_outpoints_from_db(missing_outpoints)
+            outpoint_cache.count("fetchedRows", len(fetched_outputs))
+            for outpoint, resolved_output in fetched_outputs.items():
+                outpoint_cache.put(outpoint, resolved_output)
+                resolved_outputs[outpoint] = resolved_output
+        else:
+            outpoint_cache.count("savedQueries")
 
-        query = text("""
-            WITH inputs AS (
-                SELECT
-                    unnest(:tx_ids) AS transaction_id,
-                    unnest(:tx_indices) AS index,
-                    unnest(:prev_hashes) AS previous_outpoint_hash,
-                    unnest(:prev_indices) AS previous_outpoint_index
-            )
-            SELECT
-                i.transaction_id,
-                i.index,
-                o.amount AS previous_outpoint_amount,
-                o.script_public_key AS previous_outpoint_script,
-                o.script_public_key_address AS previous_outpoint_address
-            FROM inputs i
-            JOIN transactions t ON t.transaction_id = i.previous_outpoint_hash
-            CROSS JOIN LATERAL unnest(t.outputs) AS o
-            WHERE o.index = i.previous_outpoint_index
-            """)
-
-        async with async_session() as session:
-            result = await session.execute(
-                query,
-                {
-                    "tx_ids": list(tx_ids),
-                    "tx_indices": list(tx_indices),
-                    "prev_hashes": list(prev_hashes),
-                    "prev_indices": list(prev_indices),
-                },
-            )
-            rows = result.fetchall()
-
-            resolved_inputs_dict = {(bytea_to_hex(r.transaction_id), r.index): r for r in rows}
-            for i in inputs:
-                resolved_input = resolved_inputs_dict.get((i["transaction_id"], i["index"]))
-                if resolved_input:
-                    previous_outpoint_script = bytea_to_hex(resolved_input.previous_outpoint_script)
-                    previous_outpoint_address = resolved_input.previous_outpoint_address
-                    if previous_outpoint_address:
-                        previous_outpoint_address = ADDRESS_PREFIX + ":" + previous_outpoint_address
-                    elif previous_outpoint_script:
-                        previous_outpoint_address = to_address(ADDRESS_PREFIX, previous_outpoint_script)
-                    i["previous_outpoint_amount"] = resolved_input.previous_outpoint_amount
-                    i["previous_outpoint_address"] = previous_outpoint_address
-                    if resolve_previous_outpoints == PreviousOutpointLookupMode.full:
-                        i["previous_outpoint_resolved"] = {
-                            "transaction_id": i["previous_outpoint_hash"],
-                            "index": i["previous_outpoint_index"],
-                            "amount": resolved_input.previous_outpoint_amount,
-                            "script_public_key": previous_outpoint_script,
-                            "script_public_key_address": previous_outpoint_address,
-                            "script_public_key_type": get_public_key_type(previous_outpoint_script),
-                        }
+        for i in inputs:
+            resolved_output = resolved_outputs.get((i["previous_outpoint_hash"], int(i["previous_outpoint_index"])))
+            if resolved_output:
+                previous_outpoint_amount, previous_outpoint_script, previous_outpoint_address = resolved_output
+                i["previous_outpoint_amount"] = previous_outpoint_amount
+                i["previous_outpoint_address"] = previous_outpoint_address
+                if resolve_previous_outpoints == PreviousOutpointLookupMode.full:
+                    i["previous_outpoint_resolved"] = {
+                        "transaction_id": i["previous_outpoint_hash"],
+                        "index": i["previous_outpoint_index"],
+                        "amount": previous_outpoint_amount,
+                        "script_public_key": previous_outpoint_script,
+                        "script_public_key_address": previous_outpoint_address,
+                        "script_public_key_type": get_public_key_type(previous_outpoint_script),
+                    }
     elif resolve_previous_outpoints == PreviousOutpointLookupMode.full:
         for i in inputs:
             script = i.get("previous_outpoint_script")
@@ -519,6 +570,52 @@ async def resolve_inputs_from_db(inputs, resolve_previous_outpoints, prev_out_re
     return inputs_by_txid
 
 
+async def resolve_outpoints_from_db(outpoints):
+    """
+    Returns (amount, script_public_key, address) of the outputs spent by the outpoints, by (transaction id, index).
+    """
+    prev_hashes, prev_indices = zip(*outpoints)
+    query = text("""
+        WITH outpoints AS (
+            SELECT
+                unnest(:prev_hashes) AS previous_outpoint_hash,
+                unnest(:prev_indices) AS previous_outpoint_index
+        )
+        SELECT
+            op.previous_outpoint_hash,
+            op.previous_outpoint_index,
+            o.amount AS previous_outpoint_amount,
+            o.script_public_key AS previous_outpoint_script,
+            o.script_public_key_address AS previous_outpoint_address
+        FROM outpoints op
+        JOIN transactions t ON t.transaction_id = op.previous_outpoint_hash
+        CROSS JOIN LATERAL unnest(t.outputs) AS o
+        WHERE o.index = op.previous_outpoint_index
+        """)
+
+    async with async_session() as session:
+        result = await session.execute(
+            query,
+            {
+                "prev_hashes": [bytes.fromhex(h) for h in prev_hashes],
+                "prev_indices": list(prev_indices),
+            },
+        )
+        rows = result.fetchall()
+
+    resolved_outputs = {}
+    for r in rows:
+        previous_outpoint_script = bytea_to_hex(r.previous_outpoint_script)
+        previous_outpoint_address = r.previous_outpoint_address
+        if previous_outpoint_address:
+            previous_outpoint_address = ADDRESS_PREFIX + ":" + previous_outpoint_address
+        elif previous_outpoint_script:
+            previous_outpoint_address = to_address(ADDRESS_PREFIX, previous_outpoint_script)
+        outpoint = (bytea_to_hex(r.previous_outpoint_hash), r.previous_outpoint_index)
+        resolved_outputs[outpoint] = (r.previous_outpoint_amount, previous_outpoint_script, previous_outpoint_address)
+    return resolved_outputs
+
+
 async def get_transaction_from_kaspad(block_hashes, transaction_id, include_inputs, include_outputs):
     block = await get_block_from_kaspad(block_hashes[0], True, False)
     return map_transaction_from_kaspad(block, transaction_id, block_hashes, include_inputs, include_outputs)
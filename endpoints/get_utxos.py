@@ -1,4 +1,5 @@
 # encoding: utf-8
+import asyncio
 import logging
 import os
 import re
@@ -6,14 +7,25 @@ from asyncio import wait_for
 from typing import List
 
 from fastapi import Path, HTTPException
+from kaspa import Address
 from kaspa_script_address import to_script, to_address
 from pydantic import BaseModel
 from sqlalchemy import text
 from sqlalchemy.future import select
 from starlette.responses import Response
 
-from constants import REGEX_KASPA_ADDRESS, ADDRESS_EXAMPLE, ADDRESS_PREFIX, SCRIPTS_UTXOS_LIMIT, USE_SCRIPT_FOR_ADDRESS
+from constants import (
+    REGEX_KASPA_ADDRESS,
+    ADDRESS_EXAMPLE,
+    ADDRESS_PREFIX,
+    SCRIPTS_UTXOS_LIMIT,
+    USE_SCRIPT_FOR_ADDRESS,
+    HOT_ADDRESSES_MAX,
+    HOT_ADDRESS_PROMOTE_AFTER,
+)
 from dbsession import async_session
+from helper.HotAddresses import HotAddresses
+from helper.shared_cache import get_shared, set_shared
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 from models.ScriptUtxoCount import ScriptUtxoCount
 from server import app, kaspad_client
@@ -21,6 +33,9 @@ from server import app, kaspad_client
 _logger = logging.getLogger(__name__)
 IS_SQL_DB_CONFIGURED = os.getenv("SQL_URI") is not None
 _utxo_count_table_exists: bool | None = None
+UTXO_COUNT_TABLE_CHECK_TTL = 3600
+
+hot_addresses = HotAddresses(HOT_ADDRESSES_MAX, HOT_ADDRESS_PROMOTE_AFTER)
 
 
 class OutpointModel(BaseModel):
@@ -167,15 +182,21 @@ def _utxo_count_to_ttl(count: int) -> int:
 
 
 async def get_utxos(addresses):
+    for address in addresses:
+        hot_addresses.record_request(address)
+    utxos = hot_addresses.get_utxos(addresses)
+    if utxos is not None:
+        return utxos
+    return await get_utxos_from_kaspad(addresses)
+
+
+async def get_utxos_from_kaspad(addresses):
     rpc_client = await kaspad_rpc_client()
     request = {"addresses": addresses}
     if rpc_client:
         utxos = await wait_for(rpc_client.get_utxos_by_addresses(request), 60)
         for utxo in utxos["entries"]:
-            spk = utxo["utxoEntry"]["scriptPublicKey"].lstrip("0")
-            if len(spk) % 2 == 1:
-                spk = "0" + spk
-            utxo["utxoEntry"]["scriptPublicKey"] = {"scriptPublicKey": spk}
+            convert_wrpc_utxo(utxo)
     else:
         resp = await kaspad_client.request("getUtxosByAddressesRequest", request, timeout=60)
         if resp.get("error"):
@@ -185,10 +206,138 @@ async def get_utxos(addresses):
     return utxos["entries"]
 
 
+def convert_wrpc_utxo(utxo):
+    spk = utxo["utxoEntry"]["scriptPublicKey"].lstrip("0")
+    if len(spk) % 2 == 1:
+        spk = "0" + spk
+    utxo["utxoEntry"]["scriptPublicKey"] = {"scriptPublicKey": spk}
+    return utxo
+
+
+async def _load_hot_addresses(addresses):
+    if not addresses:
+        return
+    utxos = await get_utxos_from_kaspad(addresses)
+    for address in addresses:
+        if not hot_addresses.load(address, [u for u in utxos if u["address"] == address]):
+            _logger.info("Address %s has too many UTXOs to be kept hot", address)
+
+
+async def _subscribe_hot_addresses_wrpc(rpc_client, state):
+    """
+    Subscriptions live on the primary connection and are gone after it reconnects, the hot addresses are then
+    reloaded and subscribed again.
+    """
+    if state.get("generation") != rpc_client.generation:
+        if state.get("generation") is not None:
+            _logger.warning("Hot address utxos-changed subscription lost, reloading")
+        hot_addresses.reset()
+        state["addresses"] = set()
+        state["generation"] = rpc_client.generation
+    if not rpc_client.is_connected:
+        return
+
+    if not state.get("listener_added"):
+        loop = asyncio.get_running_loop()
+
+        def on_utxos_changed(event, *args):
+            data = event.get("data", event) if isinstance(event, dict) else {}
+            added = [convert_wrpc_utxo(u) for u in data.get("added") or []]
+            # wrpc callbacks are not invoked on the event loop
+            loop.call_soon_threadsafe(hot_addresses.apply, added, data.get("removed") or [])
+
+        rpc_client.add_event_listener("utxos-changed", on_utxos_changed)
+        state["listener_added"] = True
+
+    addresses = set(hot_addresses.addresses)
+    removed = state["addresses"] - addresses
+    if removed:
+        state["addresses"] -= removed
+        await rpc_client.unsubscribe_utxos_changed([Address(a) for a in removed])
+    added = addresses - state["addresses"]
+    if added:
+        await rpc_client.subscribe_utxos_changed([Address(a) for a in added])
+        state["addresses"] |= added
+
+
+async def _subscribe_hot_addresses_grpc(state):
+    """
+    kaspad keeps one utxosChanged address set per stream, so a changed set gets a new stream. The old stream is only
+    cancelled after the new one is acknowledged, notifications received twice in between are ignored.
+    """
+    stream = state.get("stream")
+    if stream is not None and stream.done():
+        _logger.warning("Hot address utxosChanged subscription lost, reloading")
+        hot_addresses.reset()
+        stream = state["stream"] = None
+        state["addresses"] = set()
+
+    addresses = set(hot_addresses.addresses)
+    if addresses == state["addresses"]:
+        return
+
+    new_stream = None
+    if addresses:
+        acknowledged = asyncio.Event()
+
+        async def on_utxos_changed(resp):
+            if "notifyUtxosChangedResponse" in resp:
+                acknowledged.set()
+            notification = resp.get("utxosChangedNotification")
+            if notification:
+                hot_addresses.apply(notification.get("added") or [], notification.get("removed") or [])
+
+        new_stream = asyncio.create_task(
+            kaspad_client.notify("notifyUtxosChangedRequest", {"addresses": list(addresses)}, on_utxos_changed)
+        )
+        try:
+            await asyncio.wait_for(acknowledged.wait(), 10)
+        except Exception:
+            new_stream.cancel()
+            raise
+    state["stream"] = new_stream
+    state["addresses"] = addresses
+    if stream is not None:
+        stream.cancel()
+
+
+@app.on_event("startup")
+async def maintain_hot_addresses():
+    if HOT_ADDRESSES_MAX <= 0:
+        return
+
+    async def loop():
+        state = {"addresses": set()}
+        while True:
+            await asyncio.sleep(1)
+            try:
+                hot_addresses.unwatch(hot_addresses.idle())
+                for address in hot_addresses.take_promotions() | set(hot_addresses.due_for_resync()):
+                    hot_addresses.watch(address)
+
+                rpc_client = await kaspad_rpc_client()
+                if rpc_client:
+                    await _subscribe_hot_addresses_wrpc(rpc_client, state)
+                elif kaspad_client.kaspads:
+                    await _subscribe_hot_addresses_grpc(state)
+                # Snapshots are loaded once subscribed, notifications received meanwhile are replayed on top
+                if state["addresses"]:
+                    await _load_hot_addresses([a for a in hot_addresses.unloaded() if a in state["addresses"]])
+            except Exception as e:
+                _logger.warning(f"Updating hot addresses failed: {e}")
+
+    asyncio.create_task(loop())
+
+
 async def _ensure_table_known(session) -> bool:
     """Checks and caches whether script_utxo_counts exists. Returns table existence."""
     global _utxo_count_table_exists
     if _utxo_count_table_exists is None:
+        shared = await get_shared("utxo_count_table_exists")
+        if shared is not None:
+            _utxo_count_table_exists = shared[0]
+            return _utxo_count_table_exists
+
         result = await session.execute(
             text(
                 "SELECT EXISTS ("
@@ -202,6 +351,7 @@ async def _ensure_table_known(session) -> bool:
             _logger.info("script_utxo_counts helper table detected")
         else:
             _logger.info("script_utxo_counts helper table NOT found – UTXO count limiting disabled")
+        await set_shared("utxo_count_table_exists", _utxo_count_table_exists, UTXO_COUNT_TABLE_CHECK_TTL)
     return _utxo_count_table_exists
 
 
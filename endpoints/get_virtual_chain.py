@@ -15,7 +15,7 @@ from endpoints.get_transactions import resolve_inputs_from_db, PreviousOutpointL
 from endpoints.get_virtual_chain_blue_score import current_blue_score_data
 from helper.utils import add_cache_control
 from models.Block import Block
-from models.Transaction import Transaction
+from models.Transaction import transactions_by_ids
 from models.TransactionAcceptance import TransactionAcceptance
 from server import app
 
@@ -114,26 +114,14 @@ async def get_virtual_chain_transactions(
         accepted_txs_dict[accepted_tx["block_hash"]].append(accepted_tx["transaction_id"])
     del accepted_txs
 
-    async with async_session() as session:
-        tx_list = (
-            (
-                await session.execute(
-                    select(Transaction).where(
-                        Transaction.transaction_id.in_(bindparam("transaction_ids", expanding=True))
-                    ),
-                    {"transaction_ids": transaction_ids},
-                )
-            )
-            .scalars()
-            .all()
-        )
+    tx_list = await transactions_by_ids(transaction_ids)
 
     tx_inputs = await resolve_inputs_from_db(
-        [vars(i) for tx in tx_list for i in (tx.inputs or []) if i],
+        [i for tx in tx_list for i in (tx["inputs"] or []) if i],
         PreviousOutpointLookupMode.light if resolve_inputs else PreviousOutpointLookupMode.no,
     )
     tx_outputs = {}
-    for o in [vars(o) for tx in tx_list for o in (tx.outputs or []) if o]:
+    for o in [o for tx in tx_list for o in (tx["outputs"] or []) if o]:
         tx_outputs.setdefault(o["transaction_id"], []).append(o)
 
     results = []
@@ -1,17 +1,22 @@
 # encoding: utf-8
 import asyncio
 import logging
+import time
 from asyncio import wait_for
 
 from fastapi import HTTPException
 from pydantic import BaseModel
 
 from kaspad.KaspadRpcClient import kaspad_rpc_client
-from server import app, kaspad_client
+from server import app, kaspad_client, host_state
 
 _logger = logging.getLogger(__name__)
 current_blue_score_data = {"blue_score": 0}
 
+BLUE_SCORE_STALE_SECONDS = 5
+_last_blue_score_update = 0.0
+_last_blue_score_notification = 0.0
+
 
 class BlueScoreResponse(BaseModel):
     blueScore: int = 260890
@@ -32,18 +37,82 @@ async def get_virtual_selected_parent_blue_score():
         return resp["getSinkBlueScoreResponse"]
 
 
+def set_blue_score(blue_score, notified=False):
+    global _last_blue_score_update, _last_blue_score_notification
+    current_blue_score_data["blue_score"] = int(blue_score)
+    _last_blue_score_update = time.monotonic()
+    if notified:
+        _last_blue_score_notification = _last_blue_score_update
+
+
+def get_fresh_blue_score():
+    if not blue_score_is_stale():
+        return current_blue_score_data["blue_score"]
+
+
+def blue_score_is_stale():
+    return time.monotonic() - _last_blue_score_update > BLUE_SCORE_STALE_SECONDS
+
+
+def blue_score_notifications_stale():
+    return time.monotonic() - _last_blue_score_notification > BLUE_SCORE_STALE_SECONDS
+
+
+async def _on_grpc_blue_score_changed(resp):
+    notification = resp.get("sinkBlueScoreChangedNotification")
+    if notification:
+        set_blue_score(notification["sinkBlueScore"], notified=True)
+
+
+async def subscribe_blue_score():
+    """
+    Keeps a sinkBlueScoreChanged subscription alive, re-subscribing whenever the notifications stop arriving.
+    Only the worker polling for the host subscribes, the others get the blue score from the shared host state.
+    """
+    loop = asyncio.get_running_loop()
+
+    def on_wrpc_blue_score_changed(event, *args):
+        data = event.get("data", event) if isinstance(event, dict) else {}
+        blue_score = data.get("sinkBlueScore")
+        if blue_score is not None:
+            # wrpc callbacks are not invoked on the event loop
+            loop.call_soon_threadsafe(set_blue_score, blue_score, True)
+
+    listener_added = False
+    while True:
+        if not host_state.is_leader:
+            await asyncio.sleep(BLUE_SCORE_STALE_SECONDS)
+            continue
+        try:
+            rpc_client = await kaspad_rpc_client()
+            if rpc_client:
+                if blue_score_notifications_stale() and rpc_client.is_connected:
+                    if not listener_added:
+                        rpc_client.add_event_listener("sink-blue-score-changed", on_wrpc_blue_score_changed)
+                        listener_added = True
+                    await rpc_client.subscribe_sink_blue_score_changed()
+                    _logger.info("Subscribed to sink blue score changes (wrpc)")
+            elif kaspad_client.kaspads:
+                _logger.info("Subscribing to sink blue score changes (grpc)")
+                await kaspad_client.notify("notifySinkBlueScoreChangedRequest", None, _on_grpc_blue_score_changed)
+        except Exception as e:
+            _logger.warning(f"Sink blue score subscription failed: {e}")
+        await asyncio.sleep(BLUE_SCORE_STALE_SECONDS * 2)
+
+
 @app.on_event("startup")
 async def update_blue_score():
-    global current_blue_score_data
-
     async def loop():
         while True:
-            try:
-                blue_score = await get_virtual_selected_parent_blue_score()
-                current_blue_score_data["blue_score"] = int(blue_score["blueScore"])
-                logging.debug(f"Updated current_blue_score: {current_blue_score_data['blue_score']}")
-            except Exception as e:
-                logging.exception(f"Error updating blue score: {e}")
-            await asyncio.sleep(5)
+            if blue_score_is_stale():  # Fallback when there is no working subscription
+                try:
+                    blue_score = await get_virtual_selected_parent_blue_score()
+                    set_blue_score(blue_score["blueScore"])
+                    logging.debug(f"Updated current_blue_score: {current_blue_score_data['blue_score']}")
+                except Exception as e:
+                    logging.exception(f"Error updating blue score: {e}")
+            await asyncio.sleep(BLUE_SCORE_STALE_SECONDS)
 
+    host_state.share("blue_score", get_fresh_blue_score, set_blue_score, max_age=BLUE_SCORE_STALE_SECONDS)
     asyncio.create_task(loop())
+    asyncio.create_task(subscribe_blue_score())
@@ -0,0 +1,5 @@
+import os
+
+# The endpoint modules need a kaspad and a database configured on import
+os.environ.setdefault("KASPAD_HOST_1", "127.0.0.1:16110")
+os.environ.setdefault("SQL_URI", "postgresql+psycopg://127.0.0.1:5432")
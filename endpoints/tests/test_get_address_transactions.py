@@ -0,0 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from starlette.responses import Response
+
+try:
+    from .. import get_address_transactions, get_transactions
+except Exception as e:  # dbsession connects to SQL_URI on import
+    pytest.skip(f"Needs a database: {e}", allow_module_level=True)
+
+ADDRESS = "kaspa:qqkqkzjvr7zwxxmjxjkmxxdwju9kjs6e9u82uh59z07vgaks6gg62v8707g73"
+
+
+class FakeResult(object):
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession(object):
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, query):
+        return FakeResult(self.rows)
+
+
+def test_full_transactions_for_address_searches_without_acceptance_filter(monkeypatch):
+    searched = []
+
+    @asynccontextmanager
+    async def async_session(*args):
+        yield FakeSession([("ab" * 32, 1700000000000)])
+
+    async def transactions_with_acceptance_by_ids(transaction_ids, acceptance):
+        searched.append((set(transaction_ids), acceptance))
+        return []
+
+    monkeypatch.setattr(get_address_transactions, "async_session", async_session)
+    monkeypatch.setattr(get_transactions, "transactions_with_acceptance_by_ids", transactions_with_acceptance_by_ids)
+
+    result = asyncio.run(
+        get_address_transactions.get_full_transactions_for_address(
+            Response(),
+            kaspa_address=ADDRESS,
+            limit=50,
+            offset=0,
+            cursor=None,
+            fields="",
+            resolve_previous_outpoints=get_transactions.PreviousOutpointLookupMode.no,
+        )
+    )
+    assert result == []
+    assert searched == [({"ab" * 32}, None)]
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from helper.ByteLRUCache import ByteLRUCache
+
+try:
+    from .. import get_transactions
+except Exception as e:  # dbsession connects to SQL_URI on import
+    pytest.skip(f"Needs a database: {e}", allow_module_level=True)
+
+SCRIPT = "20" + "11" * 32 + "ac"
+ADDRESS = "kaspa:qqkqkzjvr7zwxxmjxjkmxxdwju9kjs6e9u82uh59z07vgaks6gg62v8707g73"
+
+
+def inputs():
+    # Two transactions spending the same outpoint, e.g. a double spend attempt
+    return [
+        {"transaction_id": "t1", "previous_outpoint_hash": "aa" * 32, "previous_outpoint_index": "0"},
+        {"transaction_id": "t2", "previous_outpoint_hash": "aa" * 32, "previous_outpoint_index": "0"},
+        {"transaction_id": "t1", "previous_outpoint_hash": "bb" * 32, "previous_outpoint_index": "1"},
+    ]
+
+
+def test_cached_outpoints_are_not_queried_again(monkeypatch):
+    queried = []
+
+    async def resolve_outpoints_from_db(outpoints):
+        queried.append(set(outpoints))
+        return {outpoint: (100, SCRIPT, ADDRESS) for outpoint in outpoints}
+
+    cache = ByteLRUCache("test-outpoints", 10**6)
+    monkeypatch.setattr(get_transactions, "outpoint_cache", cache)
+    monkeypatch.setattr(get_transactions, "resolve_outpoints_from_db", resolve_outpoints_from_db)
+    light = get_transactions.PreviousOutpointLookupMode.light
+
+    first = asyncio.run(get_transactions.resolve_inputs_from_db(inputs(), light, False))
+    assert queried == [{("aa" * 32, 0), ("bb" * 32, 1)}]
+    assert cache.counters == {"savedRows": 0, "fetchedRows": 2}
+
+    second = asyncio.run(get_transactions.resolve_inputs_from_db(inputs(), light, False))
+    assert len(queried) == 1
+    assert cache.counters == {"savedRows": 2, "fetchedRows": 2, "savedQueries": 1}
+    assert second == first
+    assert [i["previous_outpoint_amount"] for i in second["t1"] + second["t2"]] == [100, 100, 100]
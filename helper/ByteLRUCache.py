@@ -0,0 +1,75 @@
+# encoding: utf-8
+import time
+from collections import OrderedDict
+
+from helper.memory_size import approx_size
+
+# All byte-budgeted caches by name, for the stats endpoint
+caches = {}
+
+
+class ByteLRUCache(object):
+    """
+    LRU cache bounded by the approximate size of its values instead of the number of entries.
+
+    Entries can optionally expire, an expired entry counts as a miss and is dropped on lookup.
+    """
+
+    def __init__(self, name, max_bytes):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.counters = {}  # additional metrics of the cache user, reported with the stats
+        self.__entries = OrderedDict()  # key -> (value, size, expires)
+        caches[name] = self
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key):
+        entry = self.__entries.get(key)
+        if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+            self.__remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, ttl=None):
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return
+        self.__remove(key)
+        self.__entries[key] = (value, size, time.monotonic() + ttl if ttl is not None else None)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size, _) = self.__entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def __remove(self, key):
+        previous = self.__entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[1]
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.__entries),
+            "bytes": self.size,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else None,
+            **self.counters,
+        }
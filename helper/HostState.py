@@ -0,0 +1,97 @@
+# encoding: utf-8
+import asyncio
+import fcntl
+import inspect
+import json
+import logging
+import os
+
+from helper.SharedMemoryCache import SharedMemoryCache
+
+_logger = logging.getLogger(__name__)
+
+HOST_STATE_INTERVAL = 1
+HOST_STATE_MAX_SIZE = 262144
+
+
+class HostState(object):
+    """
+    State polled from kaspad and other upstreams by a single worker process per host, shared with the other workers.
+
+    The worker holding an exclusive flock on the lock file is the leader and publishes every shared value to its own
+    memory mapped segment once per interval. The other workers apply the published values instead of polling, and
+    try to take over the lock every interval, so another worker takes over when the leader exits. Values are
+    published with a max age, once the leader stops publishing the workers fall back to polling for themselves.
+
+    When disabled every worker is its own leader.
+    """
+
+    def __init__(self, directory, enabled=True, interval=HOST_STATE_INTERVAL):
+        self.directory = directory
+        self.enabled = enabled
+        self.interval = interval
+        self.is_leader = not enabled
+        self.__shared = {}  # key -> (get, apply, max_age, segment)
+        self.__lock_fd = None
+        self.__task = None
+
+    def share(self, key, get, apply, max_age, size=HOST_STATE_MAX_SIZE):
+        """
+        get() (optionally async) returns the leader's current value, or None if it has nothing fresh to share.
+        apply(value) is called in the other workers with the value published by the leader.
+        """
+        if self.enabled:
+            segment = SharedMemoryCache(os.path.join(self.directory, f"{key}.state"), slots=1, slot_size=size)
+            self.__shared[key] = (get, apply, max_age, segment)
+
+    def start(self):
+        if self.enabled and self.__task is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.__lock_fd = os.open(os.path.join(self.directory, "leader.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+            self.__elect()
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+        if self.__lock_fd is not None:
+            os.close(self.__lock_fd)  # releases the lock, another worker takes over
+            self.__lock_fd = None
+            self.is_leader = False
+
+    def __elect(self):
+        try:
+            fcntl.flock(self.__lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+        self.is_leader = True
+        _logger.info(f"Worker {os.getpid()} is polling upstream state for this host")
+
+    async def __run(self):
+        while True:
+            if not self.is_leader:
+                self.__elect()
+            for key, (get, apply, max_age, segment) in list(self.__shared.items()):
+                try:
+                    if self.is_leader:
+                        await self.__publish(key, get, max_age, segment)
+                    else:
+                        await self.__apply(key, apply, segment)
+                except Exception as e:
+                    _logger.warning(f"Sharing {key} failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    async def __publish(key, get, max_age, segment):
+        value = get()
+        if inspect.isawaitable(value):
+            value = await value
+        if value is not None:
+            await segment.set(key, json.dumps(value).encode(), max_age)
+
+    @staticmethod
+    async def __apply(key, apply, segment):
+        data = await segment.get(key)
+        if data is not None:
+            apply(json.loads(data))
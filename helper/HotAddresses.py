@@ -0,0 +1,183 @@
+# encoding: utf-8
+import time
+
+
+class HotAddress(object):
+    def __init__(self):
+        self.utxos = {}  # (transactionId, index) -> utxo entry
+        self.spent = set()
+        self.balance = 0
+        self.ready = False
+        self.pending = []
+        self.loaded = 0.0
+        self.last_access = time.monotonic()
+
+    def apply(self, added, removed):
+        for utxo in removed:
+            outpoint = outpoint_key(utxo)
+            self.spent.add(outpoint)
+            if outpoint in self.utxos:
+                self.balance -= int(self.utxos.pop(outpoint)["utxoEntry"]["amount"])
+        for utxo in added:
+            outpoint = outpoint_key(utxo)
+            if outpoint not in self.utxos and outpoint not in self.spent:
+                self.utxos[outpoint] = utxo
+                self.balance += int(utxo["utxoEntry"]["amount"])
+
+
+def outpoint_key(utxo):
+    return utxo["outpoint"]["transactionId"], int(utxo["outpoint"].get("index") or 0)
+
+
+class HotAddresses(object):
+    """
+    UTXO sets of frequently requested addresses, kept up to date from utxosChanged notifications.
+
+    An address is promoted after promote_after requests within window seconds. The subscriber watches it (from then on
+    notifications are buffered), subscribes, loads a snapshot and replays the buffered notifications on top of it.
+    An address with more than max_utxos UTXOs is not promoted again for reject_seconds.
+    Notifications are applied by outpoint and a spent outpoint is never re-added, so replays and duplicates are harmless.
+    """
+
+    def __init__(
+        self,
+        max_addresses,
+        promote_after,
+        window=60,
+        idle_seconds=300,
+        resync_seconds=600,
+        max_utxos=1000,
+        reject_seconds=3600,
+    ):
+        self.max_addresses = max_addresses
+        self.promote_after = promote_after
+        self.window = window
+        self.idle_seconds = idle_seconds
+        self.resync_seconds = resync_seconds
+        self.max_utxos = max_utxos
+        self.reject_seconds = reject_seconds
+        self.__rejected = {}  # address -> rejected at
+        self.__hits = {}  # address -> [window start, count]
+        self.__promotions = set()
+        self.__watched = {}
+
+    @property
+    def addresses(self):
+        return list(self.__watched)
+
+    def record_request(self, address):
+        if self.max_addresses <= 0:
+            return
+        now = time.monotonic()
+        hot_address = self.__watched.get(address)
+        if hot_address is not None:
+            hot_address.last_access = now
+            return
+        if address in self.__promotions or len(self.__watched) + len(self.__promotions) >= self.max_addresses:
+            return
+        rejected = self.__rejected.get(address)
+        if rejected is not None:
+            if now - rejected < self.reject_seconds:
+                return
+            del self.__rejected[address]
+
+        hits = self.__hits.get(address)
+        if hits is None or now - hits[0] > self.window:
+            if len(self.__hits) >= self.max_addresses * 10:
+                self.__hits = {a: h for a, h in self.__hits.items() if now - h[0] <= self.window}
+            hits = self.__hits[address] = [now, 0]
+        hits[1] += 1
+        if hits[1] >= self.promote_after:
+            del self.__hits[address]
+            self.__promotions.add(address)
+
+    def get_utxos(self, addresses):
+        """
+        Returns the cached UTXOs of all addresses, or None if any of them is not cached.
+        """
+        hot_addresses = self.__get_ready(addresses)
+        if hot_addresses is not None:
+            return [utxo for hot_address in hot_addresses for utxo in hot_address.utxos.values()]
+
+    def get_balances(self, addresses):
+        hot_addresses = self.__get_ready(addresses)
+        if hot_addresses is not None:
+            return [hot_address.balance for hot_address in hot_addresses]
+
+    def take_promotions(self):
+        promotions, self.__promotions = self.__promotions, set()
+        return promotions
+
+    def watch(self, address):
+        """
+        Starts buffering notifications for the address, ahead of subscribing and loading the snapshot.
+        """
+        hot_address = HotAddress()
+        previous = self.__watched.get(address)
+        if previous is not None:
+            hot_address.last_access = previous.last_access
+        self.__watched[address] = hot_address
+
+    def load(self, address, utxos):
+        """
+        Sets the snapshot and replays the notifications received since watch(). Returns False if not cacheable.
+        """
+        hot_address = self.__watched.get(address)
+        if hot_address is None:
+            return False
+        if len(utxos) > self.max_utxos:
+            del self.__watched[address]
+            now = time.monotonic()
+            if len(self.__rejected) >= self.max_addresses * 10:
+                self.__rejected = {a: r for a, r in self.__rejected.items() if now - r < self.reject_seconds}
+            self.__rejected[address] = now
+            return False
+        pending, hot_address.pending = hot_address.pending, None
+        hot_address.apply(utxos, [])
+        for added, removed in pending:
+            hot_address.apply(added, removed)
+        hot_address.ready = True
+        hot_address.loaded = time.monotonic()
+        return True
+
+    def apply(self, added, removed):
+        changes = {}
+        for utxo in added:
+            if utxo.get("address") in self.__watched:
+                changes.setdefault(utxo["address"], ([], []))[0].append(utxo)
+        for utxo in removed:
+            if utxo.get("address") in self.__watched:
+                changes.setdefault(utxo["address"], ([], []))[1].append(utxo)
+        for address, (address_added, address_removed) in changes.items():
+            hot_address = self.__watched[address]
+            if hot_address.ready:
+                hot_address.apply(address_added, address_removed)
+            else:
+                hot_address.pending.append((address_added, address_removed))
+
+    def unloaded(self):
+        return [a for a, h in self.__watched.items() if not h.ready]
+
+    def idle(self):
+        now = time.monotonic()
+        return [a for a, h in self.__watched.items() if now - h.last_access > self.idle_seconds]
+
+    def due_for_resync(self):
+        now = time.monotonic()
+        return [a for a, h in self.__watched.items() if h.ready and now - h.loaded > self.resync_seconds]
+
+    def unwatch(self, addresses):
+        for address in addresses:
+            self.__watched.pop(address, None)
+
+    def reset(self):
+        """
+        Drops all cached state (e.g. after losing the subscription), the addresses are promoted again right away.
+        """
+        self.__promotions.update(self.__watched)
+        self.__watched = {}
+
+    def __get_ready(self, addresses):
+        hot_addresses = [self.__watched.get(address) for address in addresses]
+        if hot_addresses and all(h is not None and h.ready for h in hot_addresses):
+            return hot_addresses
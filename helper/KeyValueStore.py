@@ -1,7 +1,7 @@
 # encoding: utf-8
 from sqlalchemy import select, update, insert
 
-from dbsession import async_session
+from dbsession import async_session, async_session_primary
 from models.Variable import KeyValueModel
 
 
@@ -12,7 +12,7 @@ async def get(key):
 
 
 async def set(key, value):
-    async with async_session() as s:
+    async with async_session_primary() as s:
         result = await s.execute(update(KeyValueModel).where(KeyValueModel.key == key).values(value=value))
 
         if result.rowcount == 1:
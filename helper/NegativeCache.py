@@ -0,0 +1,91 @@
+# encoding: utf-8
+import hashlib
+import math
+import time
+
+from helper.ByteLRUCache import caches
+
+
+class BloomFilter(object):
+    def __init__(self, capacity, fp_rate):
+        self.size = max(int(-capacity * math.log(fp_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.count = 0
+        self.__bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key):
+        for position in self.__positions(key):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.__bits[position >> 3] & (1 << (position & 7)) for position in self.__positions(key))
+
+    def __positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+
+class NegativeCache(object):
+    """
+    Remembers keys that were recently looked up without result, in two rotating Bloom filters.
+
+    The current filter is replaced every ttl / 2 seconds (or when it is full), the previous one is still consulted
+    until it was started ttl seconds ago, so a key is remembered for at most ttl seconds. Memory is fixed by capacity
+    and fp_rate. A false positive answers a key as missing that was never added, so fp_rate is kept very low.
+    """
+
+    def __init__(self, name, capacity, ttl, fp_rate=1e-6):
+        self.name = name
+        self.capacity = capacity
+        self.ttl = ttl
+        self.fp_rate = fp_rate
+        self.hits = 0
+        self.misses = 0
+        self.rotations = 0
+        self.__current = BloomFilter(capacity, fp_rate) if capacity > 0 else None
+        self.__previous = None
+        self.__previous_started = 0.0
+        self.__rotated = time.monotonic()
+        caches[name] = self
+
+    def add(self, key):
+        if self.__current is None:
+            return
+        self.__rotate()
+        if self.__current.count >= self.capacity:
+            self.__rotate(force=True)
+        self.__current.add(key)
+
+    def __contains__(self, key):
+        if self.__current is None:
+            return False
+        self.__rotate()
+        if key in self.__current or (self.__previous is not None and key in self.__previous):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "bytes": 2 * ((self.__current.size + 7) // 8) if self.__current is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "rotations": self.rotations,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+    def __rotate(self, force=False):
+        now = time.monotonic()
+        if force or now - self.__rotated >= self.ttl / 2:
+            self.__previous, self.__previous_started = self.__current, self.__rotated
+            self.__current = BloomFilter(self.capacity, self.fp_rate)
+            self.__rotated = now
+            self.rotations += 1
+        if self.__previous is not None and now - self.__previous_started >= self.ttl:
+            # Every key in it was added more than ttl ago
+            self.__previous = None
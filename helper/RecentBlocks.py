@@ -0,0 +1,132 @@
+# encoding: utf-8
+import time
+from collections import OrderedDict
+
+from helper.memory_size import approx_size
+
+
+class RecentBlocks(object):
+    """
+    Ring buffer of the newest blocks (with transactions) as received from kaspad, indexed by block hash,
+    transaction id and blue score.
+
+    Blocks are evicted oldest first, when they are older than max_age seconds or the buffer exceeds max_bytes.
+    Header and transactions of a block never change, childrenHashes and isChainBlock are derived from the buffer
+    itself when a block is read.
+    """
+
+    def __init__(self, max_age, max_bytes):
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.__blocks = OrderedDict()  # hash -> (block, size, added)
+        self.__children = {}
+        self.__by_transaction = {}
+        self.__by_blue_score = {}
+        self.__tip = None
+        self.__last_added = 0.0
+
+    def __len__(self):
+        return len(self.__blocks)
+
+    def __contains__(self, block_hash):
+        return block_hash in self.__blocks
+
+    def add(self, block):
+        verbose_data = block.get("verboseData") or {}
+        block_hash = verbose_data.get("hash")
+        if not block_hash or verbose_data.get("isHeaderOnly") or block_hash in self.__blocks:
+            return
+
+        size = approx_size(block)
+        self.__last_added = time.monotonic()
+        self.__blocks[block_hash] = (block, size, self.__last_added)
+        self.size += size
+        for parent_hash in self.__parent_hashes(block):
+            self.__children.setdefault(parent_hash, []).append(block_hash)
+        for tx_id in verbose_data.get("transactionIds") or []:
+            self.__by_transaction.setdefault(tx_id, []).append(block_hash)
+        self.__by_blue_score.setdefault(int(block["header"]["blueScore"]), []).append(block_hash)
+        if self.__tip is None or self.__blue_work(block) > self.__blue_work(self.__blocks[self.__tip][0]):
+            self.__tip = block_hash
+        self.__evict()
+
+    def is_stale(self, seconds):
+        return time.monotonic() - self.__last_added > seconds
+
+    def get_block(self, block_hash, include_transactions=True):
+        """
+        Returns a shallow copy of the block, safe for the caller to modify on the top level.
+        """
+        entry = self.__blocks.get(block_hash)
+        if entry is None:
+            return None
+        block = dict(entry[0])
+        block["verboseData"] = dict(block["verboseData"])
+        block["verboseData"]["childrenHashes"] = list(self.__children.get(block_hash, []))
+        is_chain_block = self.__is_chain_block(block_hash)
+        if is_chain_block is not None:
+            block["verboseData"]["isChainBlock"] = is_chain_block
+        if not include_transactions:
+            block["transactions"] = []
+        return block
+
+    def get_transaction_block_hashes(self, transaction_id):
+        return list(self.__by_transaction.get(transaction_id, []))
+
+    def get_block_hashes_by_blue_score(self, blue_score):
+        return list(self.__by_blue_score.get(blue_score, []))
+
+    def __is_chain_block(self, block_hash):
+        """
+        Walks the selected parent chain down from the heaviest known block.
+        Returns None if the answer cannot be determined from the buffer.
+        """
+        target_blue_score = int(self.__blocks[block_hash][0]["header"]["blueScore"])
+        current = self.__tip
+        while current in self.__blocks:
+            if current == block_hash:
+                return True
+            block = self.__blocks[current][0]
+            if int(block["header"]["blueScore"]) <= target_blue_score:
+                return False
+            current = block["verboseData"].get("selectedParentHash")
+        return None
+
+    def __evict(self):
+        oldest_allowed = time.monotonic() - self.max_age
+        while self.__blocks:
+            block_hash, (block, size, added) = next(iter(self.__blocks.items()))
+            if added >= oldest_allowed and self.size <= self.max_bytes:
+                break
+            self.__remove(block_hash, block, size)
+
+    def __remove(self, block_hash, block, size):
+        del self.__blocks[block_hash]
+        self.size -= size
+        self.__children.pop(block_hash, None)
+        for parent_hash in self.__parent_hashes(block):
+            self.__discard(self.__children, parent_hash, block_hash)
+        for tx_id in block["verboseData"].get("transactionIds") or []:
+            self.__discard(self.__by_transaction, tx_id, block_hash)
+        self.__discard(self.__by_blue_score, int(block["header"]["blueScore"]), block_hash)
+        if self.__tip == block_hash:
+            self.__tip = None
+
+    @staticmethod
+    def __discard(index, key, block_hash):
+        block_hashes = index.get(key)
+        if block_hashes is not None:
+            if block_hash in block_hashes:
+                block_hashes.remove(block_hash)
+            if not block_hashes:
+                del index[key]
+
+    @staticmethod
+    def __parent_hashes(block):
+        parents = block["header"].get("parents") or []
+        return (parents[0].get("parentHashes") or []) if parents else []
+
+    @staticmethod
+    def __blue_work(block):
+        return int(block["header"].get("blueWork") or "0", 16)
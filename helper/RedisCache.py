@@ -0,0 +1,90 @@
+# encoding: utf-8
+import asyncio
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisCache(object):
+    """
+    Minimal asyncio client speaking the Redis protocol (RESP), limited to what the shared cache needs: GET and SET
+    with an expiry. Commands are sent one at a time over a single connection, which is reopened after any error.
+    """
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, timeout=1):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.__reader = None
+        self.__writer = None
+        self.__lock = None
+
+    async def get(self, key):
+        return await self.__command("GET", key)
+
+    async def set(self, key, value, ttl):
+        await self.__command("SET", key, value, "PX", max(int(ttl * 1000), 1))
+
+    async def close(self):
+        if self.__writer is not None:
+            self.__writer.close()
+        self.__reader = self.__writer = None
+
+    async def __command(self, *args):
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            try:
+                if self.__writer is None:
+                    await asyncio.wait_for(self.__connect(), self.timeout)
+                return await asyncio.wait_for(self.__execute(args), self.timeout)
+            except Exception:
+                await self.close()
+                raise
+
+    async def __connect(self):
+        self.__reader, self.__writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self.__execute(("AUTH", self.password))
+        if self.db:
+            await self.__execute(("SELECT", self.db))
+
+    async def __execute(self, args):
+        self.__writer.write(encode_command(args))
+        await self.__writer.drain()
+        return await self.__read_reply()
+
+    async def __read_reply(self):
+        line = await self.__reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise RedisError("Connection closed")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload
+        if prefix == b"-":
+            raise RedisError(payload.decode(errors="replace"))
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self.__reader.readexactly(length + 2))[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self.__read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+
+def encode_command(args):
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
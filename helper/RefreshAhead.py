@@ -0,0 +1,110 @@
+# encoding: utf-8
+import asyncio
+import logging
+import time
+from functools import wraps
+
+from helper.SingleFlight import SingleFlight
+
+_logger = logging.getLogger(__name__)
+
+
+class RefreshAheadEntry(object):
+    def __init__(self, fn, args, kwargs, fresh_seconds):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.fresh_seconds = fresh_seconds
+        self.value = None
+        self.loaded = None
+        self.next_refresh = float("inf")
+        self.last_access = time.monotonic()
+
+
+class RefreshAhead(object):
+    """
+    Keeps the results of decorated coroutine functions in memory, a background task refreshes each of them shortly
+    before its freshness window ends.
+
+    Only the first call (per distinct arguments) waits for the function. When a refresh fails the previous value is
+    served until it is max_stale_factor times its freshness window old, after that callers wait for the function
+    again. Values not read for idle_seconds are dropped instead of being refreshed.
+    """
+
+    def __init__(self, lead=0.2, retry_seconds=1, max_stale_factor=10, idle_seconds=300):
+        self.lead = lead
+        self.retry_seconds = retry_seconds
+        self.max_stale_factor = max_stale_factor
+        self.idle_seconds = idle_seconds
+        self.single_flight = SingleFlight()
+        self.__entries = {}
+        self.__wake = None
+        self.__task = None
+
+    def __call__(self, fresh_seconds):
+        def decorator(fn):
+            @wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await self.get(fn, fresh_seconds, args, kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def get(self, fn, fresh_seconds, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        key = (fn, args, tuple(sorted(kwargs.items())))
+        entry = self.__entries.get(key)
+        if entry is None:
+            entry = self.__entries[key] = RefreshAheadEntry(fn, args, kwargs, fresh_seconds)
+        entry.last_access = time.monotonic()
+        self.__start()
+
+        if entry.loaded is None or entry.last_access - entry.loaded > fresh_seconds * self.max_stale_factor:
+            await self.single_flight.do(key, lambda: self.__refresh(entry))
+            self.__wake.set()
+        return entry.value
+
+    def __start(self):
+        if self.__task is None or self.__task.done():
+            self.__wake = asyncio.Event()
+            self.__task = asyncio.create_task(self.__run())
+
+    async def __refresh(self, entry):
+        entry.value = await entry.fn(*entry.args, **entry.kwargs)
+        entry.loaded = time.monotonic()
+        entry.next_refresh = entry.loaded + entry.fresh_seconds * (1 - self.lead)
+
+    async def __refresh_in_background(self, key, entry):
+        try:
+            await self.single_flight.do(key, lambda: self.__refresh(entry))
+        except Exception as e:
+            _logger.warning(f"Refreshing {entry.fn.__name__} failed: {e}")
+            entry.next_refresh = time.monotonic() + self.retry_seconds
+        self.__wake.set()
+
+    async def __run(self):
+        refreshing = set()
+        while True:
+            now = time.monotonic()
+            for key, entry in list(self.__entries.items()):
+                if now - entry.last_access > self.idle_seconds:
+                    del self.__entries[key]
+                elif entry.next_refresh <= now:
+                    # A slow function must not hold up the refresh of the others
+                    entry.next_refresh = float("inf")
+                    task = asyncio.create_task(self.__refresh_in_background(key, entry))
+                    refreshing.add(task)
+                    task.add_done_callback(refreshing.discard)
+
+            next_refresh = min((e.next_refresh for e in self.__entries.values()), default=float("inf"))
+            timeout = min(next_refresh - now, self.idle_seconds)
+            self.__wake.clear()
+            try:
+                async with asyncio.timeout(max(timeout, 0)):
+                    await self.__wake.wait()
+            except TimeoutError:
+                pass
+
+
+refresh_ahead = RefreshAhead()
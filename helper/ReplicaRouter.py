@@ -0,0 +1,88 @@
+# encoding: utf-8
+import asyncio
+import logging
+import math
+
+from sqlalchemy import text
+
+_logger = logging.getLogger(__name__)
+
+REPLICA_LAG_INTERVAL = 1
+
+# In recovery, replayed everything received, receiving WAL from the primary and seconds since the last replayed
+# transaction. pg_stat_wal_receiver only shows the status to superusers and pg_read_all_stats members.
+LAG_QUERY = text(
+    "SELECT pg_is_in_recovery(),"
+    " pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(),"
+    " EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'),"
+    " EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+)
+
+
+def replication_lag(in_recovery, caught_up, streaming, replay_age):
+    """
+    Seconds the replica is behind its primary. A streaming replica that replayed everything it received is not
+    lagging, even if the last replayed transaction is old because nothing was written on the primary since. Without
+    streaming (e.g. the WAL receiver disconnected) having replayed everything says nothing, the replay age is used.
+    """
+    if not in_recovery:
+        return 0.0
+    if caught_up and streaming:
+        return 0.0
+    if replay_age is None:
+        return math.inf  # nothing replayed yet
+    return max(float(replay_age), 0.0)
+
+
+class ReplicaRouter(object):
+    """
+    Picks the engine to read from: the freshest read replica that is within the allowed lag and has a free connection
+    in its pool, otherwise the primary.
+
+    The replication lag of every replica is polled once per interval, a replica that can't be reached is skipped
+    until it answers again.
+    """
+
+    def __init__(self, primary, replicas, capacity, interval=REPLICA_LAG_INTERVAL):
+        self.primary = primary
+        self.replicas = replicas
+        self.capacity = capacity  # connections per pool, pool size + max overflow
+        self.interval = interval
+        self.lag = {}  # replica -> seconds behind, unknown until checked
+        self.__task = None
+
+    def engine(self, max_lag):
+        candidates = [
+            replica
+            for replica in self.replicas
+            if self.lag.get(replica, math.inf) <= max_lag and replica.pool.checkedout() < self.capacity
+        ]
+        if not candidates:
+            return self.primary
+        return min(candidates, key=lambda replica: (self.lag[replica], replica.pool.checkedout()))
+
+    def start(self):
+        if self.replicas and self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+
+    async def __run(self):
+        while True:
+            await asyncio.gather(*(self.__check(replica) for replica in self.replicas))
+            await asyncio.sleep(self.interval)
+
+    async def __check(self, replica):
+        try:
+            async with asyncio.timeout(max(self.interval, 1)):
+                async with replica.connect() as conn:
+                    row = (await conn.execute(LAG_QUERY)).one()
+        except Exception as e:
+            if self.lag.get(replica) != math.inf:
+                _logger.warning(f"Replica {replica.url.host} unavailable: {e}")
+            self.lag[replica] = math.inf
+            return
+        self.lag[replica] = replication_lag(*row)
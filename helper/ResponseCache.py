@@ -0,0 +1,115 @@
+# encoding: utf-8
+import asyncio
+import re
+import time
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+
+from helper.ByteLRUCache import ByteLRUCache
+from helper.etag import etag_matches
+
+MAX_AGE_RE = re.compile(r"(?:^|[,\s])max-age=(\d+)")
+UNCACHEABLE_DIRECTIVES = ("private", "no-store", "no-cache")
+UNCACHEABLE_KEYS_MAX = 10000
+
+
+class ResponseCache(object):
+    """
+    ASGI middleware keeping successful GET responses for the max-age the handler set in its Cache-Control header.
+
+    Placed outside the GZip middleware, so the stored body is already compressed and gzip acceptance is part of the
+    key. Concurrent misses for the same key wait for the first one instead of all hitting the handler, when its
+    response turns out not to be cacheable they go to the handler themselves. Keys whose last response was not
+    cacheable skip the waiting until a cacheable response comes back. Conditional requests matching the ETag of a
+    cached response get a 304.
+    """
+
+    def __init__(self, app, max_bytes):
+        self.app = app
+        self.cache = ByteLRUCache("responses", max_bytes)
+        self.__in_flight = {}
+        self.__uncacheable = set()  # keys whose last response was not cacheable
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or self.cache.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        key = self.cache_key(scope)
+        if key in self.__uncacheable:
+            await self.__fetch(key, scope, receive, send)
+            return
+        entry = self.cache.get(key)
+        in_flight = self.__in_flight.get(key)
+        if entry is None and in_flight is not None:
+            await asyncio.shield(in_flight)
+            entry = self.cache.get(key)
+        if entry is not None:
+            await self.__send_entry(entry, Headers(scope=scope).get("if-none-match"), send)
+            return
+        if in_flight is not None:
+            await self.app(scope, receive, send)
+            return
+
+        in_flight = self.__in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            await self.__fetch(key, scope, receive, send)
+        finally:
+            del self.__in_flight[key]
+            in_flight.set_result(None)
+
+    @staticmethod
+    def cache_key(scope):
+        query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        accepts_gzip = "gzip" in Headers(scope=scope).get("accept-encoding", "")
+        return scope["path"], query, accepts_gzip
+
+    async def __fetch(self, key, scope, receive, send):
+        response = {}
+        body = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = list(message.get("headers", []))
+                response["ttl"] = self.__ttl(message)
+                if response["ttl"]:
+                    self.__uncacheable.discard(key)
+                else:
+                    if len(self.__uncacheable) >= UNCACHEABLE_KEYS_MAX:
+                        self.__uncacheable.clear()
+                    self.__uncacheable.add(key)
+            elif message["type"] == "http.response.body" and response.get("ttl"):
+                body.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    entry = (response["status"], response["headers"], b"".join(body), time.time())
+                    self.cache.put(key, entry, ttl=response["ttl"])
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+    @staticmethod
+    def __ttl(message):
+        if message["status"] != 200:
+            return None
+        headers = Headers(raw=message.get("headers", []))
+        cache_control = headers.get("cache-control", "").lower()
+        if "set-cookie" in headers or any(d in cache_control for d in UNCACHEABLE_DIRECTIVES):
+            return None
+        match = MAX_AGE_RE.search(cache_control)
+        if match and int(match.group(1)) > 0:
+            return int(match.group(1))
+
+    @staticmethod
+    async def __send_entry(entry, if_none_match, send):
+        status, headers, body, stored = entry
+        age = (b"age", str(int(time.time() - stored)).encode())
+        etag = Headers(raw=headers).get("etag")
+        if etag_matches(if_none_match, etag):
+            headers = [(k, v) for k, v in headers if k in (b"etag", b"cache-control", b"vary")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers + [age]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": status, "headers": headers + [age]})
+        await send({"type": "http.response.body", "body": body})
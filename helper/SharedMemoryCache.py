@@ -0,0 +1,73 @@
+# encoding: utf-8
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+SLOT_HEADER = struct.Struct("<dHI")  # expires (epoch seconds), key length, value length
+
+
+def default_directory():
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class SharedMemoryCache(object):
+    """
+    Cache shared by the worker processes of one host, kept in a memory mapped file (on /dev/shm by default).
+
+    The file is split in fixed size slots and a key maps to exactly one slot, a colliding key simply overwrites it.
+    Each slot is guarded by an fcntl record lock, so a reader never sees an entry that is half written by another
+    process. Values larger than a slot are not stored.
+    """
+
+    def __init__(self, path, slots=256, slot_size=65536):
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.__fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = slots * slot_size
+        if os.fstat(self.__fd).st_size < size:
+            os.ftruncate(self.__fd, size)
+        self.__mmap = mmap.mmap(self.__fd, size)
+
+    async def get(self, key):
+        key = key.encode()
+        offset = self.__offset(key)
+        fcntl.lockf(self.__fd, fcntl.LOCK_SH, self.slot_size, offset)
+        try:
+            expires, key_length, value_length = SLOT_HEADER.unpack_from(self.__mmap, offset)
+            start = offset + SLOT_HEADER.size
+            if (
+                expires < time.time()
+                or key_length != len(key)
+                or SLOT_HEADER.size + key_length + value_length > self.slot_size
+                or self.__mmap[start : start + key_length] != key
+            ):
+                return None
+            return self.__mmap[start + key_length : start + key_length + value_length]
+        finally:
+            fcntl.lockf(self.__fd, fcntl.LOCK_UN, self.slot_size, offset)
+
+    async def set(self, key, value, ttl):
+        key = key.encode()
+        if SLOT_HEADER.size + len(key) + len(value) > self.slot_size:
+            return
+        offset = self.__offset(key)
+        fcntl.lockf(self.__fd, fcntl.LOCK_EX, self.slot_size, offset)
+        try:
+            SLOT_HEADER.pack_into(self.__mmap, offset, time.time() + ttl, len(key), len(value))
+            start = offset + SLOT_HEADER.size
+            self.__mmap[start : start + len(key) + len(value)] = key + value
+        finally:
+            fcntl.lockf(self.__fd, fcntl.LOCK_UN, self.slot_size, offset)
+
+    def close(self):
+        self.__mmap.close()
+        os.close(self.__fd)
+
+    def __offset(self, key):
+        # crc32 rather than hash(), which is salted differently in every process
+        return (zlib.crc32(key) % self.slots) * self.slot_size
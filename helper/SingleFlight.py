@@ -0,0 +1,33 @@
+# encoding: utf-8
+import asyncio
+import copy
+
+
+class SingleFlight(object):
+    """
+    Collapses concurrent calls with the same key into one execution and fans the result out to every caller.
+
+    The shared call runs in its own task, so a cancelled caller does not cancel it for the others.
+    When more than one caller waited, each one receives its own deep copy, as callers mutate the responses.
+    """
+
+    def __init__(self):
+        self.__calls = {}
+
+    async def do(self, key, fn):
+        call = self.__calls.get(key)
+        if call is None:
+            call = self.__calls[key] = [asyncio.ensure_future(fn()), 0]
+            call[0].add_done_callback(lambda _: self.__forget(key, call))
+        call[1] += 1
+
+        result = await asyncio.shield(call[0])
+        return result if call[1] == 1 else copy.deepcopy(result)
+
+    @property
+    def in_flight(self):
+        return len(self.__calls)
+
+    def __forget(self, key, call):
+        if self.__calls.get(key) is call:
+            del self.__calls[key]
@@ -6,6 +6,8 @@ import aiocache
 import aiohttp
 from aiocache import cached
 
+from helper.shared_cache import shared_cached
+
 FLOOD_DETECTED = False
 CACHE = None
 
@@ -20,7 +22,7 @@ async def get_kas_price():
     return market_data.get("current_price", {}).get("usd", 0)
 
 
-@cached(ttl=60)
+@shared_cached("kas_market_data", ttl=60)
 async def get_kas_market_data():
     global FLOOD_DETECTED
     global CACHE
@@ -0,0 +1,24 @@
+# encoding: utf-8
+import base64
+import binascii
+
+
+def encode_cursor(block_time, transaction_id):
+    """
+    Opaque continuation token for keyset paging over (block_time, transaction_id), newest first.
+    """
+    data = int(block_time).to_bytes(8, "big") + bytes.fromhex(transaction_id)
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Returns (block_time, transaction_id) from a token created by encode_cursor, raises ValueError if it is invalid.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except (binascii.Error, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if len(data) != 40:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int.from_bytes(data[:8], "big"), data[8:].hex()
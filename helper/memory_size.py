@@ -0,0 +1,14 @@
+# encoding: utf-8
+import sys
+
+
+def approx_size(obj):
+    """
+    Rough recursive estimate of the memory used by a decoded json structure (dicts, lists and scalars).
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(approx_size(v) for v in obj)
+    return size
@@ -0,0 +1,101 @@
+# encoding: utf-8
+import json
+import logging
+import os
+import time
+from functools import wraps
+from urllib.parse import urlsplit
+
+from constants import NETWORK_TYPE, SHARED_CACHE_URL
+from helper.RedisCache import RedisCache
+from helper.SharedMemoryCache import SharedMemoryCache, default_directory
+from helper.SingleFlight import SingleFlight
+
+_logger = logging.getLogger(__name__)
+
+KEY_PREFIX = f"kaspa-rest-server:{NETWORK_TYPE}:"
+
+
+def create_shared_cache(url):
+    """
+    Creates the L2 cache shared between worker processes from a url:
+    shm:// or shm:///path/to/file for a memory mapped file, redis://[:password@]host[:port][/db] for Redis.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if parts.scheme == "shm":
+        return SharedMemoryCache(
+            parts.path or os.path.join(default_directory(), f"kaspa-rest-server-{NETWORK_TYPE}.cache")
+        )
+    if parts.scheme == "redis":
+        db = int(parts.path.strip("/") or 0)
+        return RedisCache(parts.hostname or "localhost", parts.port or 6379, db, parts.password)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL scheme: {parts.scheme}")
+
+
+shared_cache = create_shared_cache(SHARED_CACHE_URL)
+
+
+async def get_shared(key):
+    """
+    Returns (value, expires) from the shared cache, or None if it is not there (or the cache is unavailable).
+    """
+    if shared_cache is None:
+        return None
+    try:
+        data = await shared_cache.get(KEY_PREFIX + key)
+    except Exception as e:
+        _logger.warning(f"Shared cache get failed: {e}")
+        return None
+    if data is not None:
+        value, expires = json.loads(data)
+        if expires > time.time():
+            return value, expires
+
+
+async def set_shared(key, value, ttl):
+    if shared_cache is None:
+        return
+    try:
+        await shared_cache.set(KEY_PREFIX + key, json.dumps([value, time.time() + ttl]).encode(), ttl)
+    except Exception as e:
+        _logger.warning(f"Shared cache set failed: {e}")
+
+
+def shared_cached(key, ttl):
+    """
+    Caches the (json serializable) result of a coroutine function without arguments in this process (L1) and in the
+    shared cache (L2), so only one worker has to call the function per ttl. None results are not cached.
+    """
+    local = {}
+    single_flight = SingleFlight()
+
+    def decorator(fn):
+        async def load():
+            shared = await get_shared(key)
+            if shared is not None:
+                local["value"], local["expires"] = shared
+                return shared[0]
+            value = await fn()
+            if value is not None:
+                local["value"], local["expires"] = value, time.time() + ttl
+                await set_shared(key, value, ttl)
+            return value
+
+        @wraps(fn)
+        async def wrapper():
+            if local and local["expires"] > time.time():
+                return local["value"]
+            return await single_flight.do(key, load)
+
+        def prime(value):
+            """
+            Sets the process cached value, e.g. from state shared by another worker.
+            """
+            local["value"], local["expires"] = value, time.time() + ttl
+
+        wrapper.prime = prime
+        return wrapper
+
+    return decorator
@@ -0,0 +1,41 @@
+from ..ByteLRUCache import ByteLRUCache
+
+
+def test_least_recently_used_is_evicted_over_budget():
+    cache = ByteLRUCache("test-lru", 10**6)
+    cache.put("a", {"hash": "a" * 64})
+    cache.put("b", {"hash": "b" * 64})
+    cache.max_bytes = cache.size
+    assert cache.get("a") is not None
+    cache.put("c", {"hash": "c" * 64})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_values_over_budget_are_not_admitted():
+    cache = ByteLRUCache("test-lru-small", 10)
+    cache.put("a", {"hash": "a" * 64})
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_expired_entries_are_misses():
+    cache = ByteLRUCache("test-lru-ttl", 10**6)
+    cache.put("a", {"hash": "a" * 64}, ttl=0)
+    cache.put("b", {"hash": "b" * 64}, ttl=60)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert len(cache) == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_counters_are_reported_with_stats():
+    cache = ByteLRUCache("test-lru-counters", 10**6)
+    cache.count("savedRows", 3)
+    cache.count("savedRows")
+    assert cache.stats()["savedRows"] == 4
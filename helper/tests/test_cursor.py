@@ -0,0 +1,16 @@
+import pytest
+
+from ..cursor import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    tx_id = "ab" * 32
+    cursor = encode_cursor(1700000000123, tx_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (1700000000123, tx_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", encode_cursor(1, "ab" * 32)[:-4]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,33 @@
+import asyncio
+
+from ..HostState import HostState
+
+
+def test_leader_shares_state_and_hands_over_when_stopped(tmp_path):
+    applied = []
+
+    async def run():
+        leader = HostState(str(tmp_path), interval=0.01)
+        follower = HostState(str(tmp_path), interval=0.01)
+        for host_state, value in ((leader, 1), (follower, 2)):
+            host_state.share("blue_score", lambda value=value: value, applied.append, max_age=5)
+            host_state.start()
+        await asyncio.sleep(0.05)
+        roles = leader.is_leader, follower.is_leader
+
+        await leader.stop()
+        await asyncio.sleep(0.05)
+        roles_after_stop = leader.is_leader, follower.is_leader
+        await follower.stop()
+        return roles, roles_after_stop
+
+    roles, roles_after_stop = asyncio.run(run())
+    assert roles == (True, False)
+    assert roles_after_stop == (False, True)
+    assert applied and set(applied) == {1}
+
+
+def test_disabled_host_state_always_leads(tmp_path):
+    host_state = HostState(str(tmp_path), enabled=False)
+    host_state.share("blue_score", lambda: 1, print, max_age=5)
+    assert host_state.is_leader
@@ -0,0 +1,61 @@
+from ..HotAddresses import HotAddresses
+
+ADDRESS = "kaspa:qqkqkzjvr7zwxxmjxjkmxxdwju9kjs6e9u82uh59z07vgaks6gg62v8707g73"
+
+
+def utxo(tx_id, amount=100, index=0):
+    return {
+        "address": ADDRESS,
+        "outpoint": {"transactionId": tx_id, "index": index},
+        "utxoEntry": {"amount": str(amount)},
+    }
+
+
+def test_address_is_promoted_after_repeated_requests():
+    hot_addresses = HotAddresses(10, 3)
+    for _ in range(2):
+        hot_addresses.record_request(ADDRESS)
+    assert hot_addresses.take_promotions() == set()
+    hot_addresses.record_request(ADDRESS)
+    assert hot_addresses.take_promotions() == {ADDRESS}
+
+
+def test_notifications_are_buffered_until_loaded():
+    hot_addresses = HotAddresses(10, 1)
+    hot_addresses.watch(ADDRESS)
+    hot_addresses.apply([utxo("b", 50)], [utxo("a")])
+    assert hot_addresses.get_utxos([ADDRESS]) is None
+
+    hot_addresses.load(ADDRESS, [utxo("a"), utxo("c", 25)])
+    assert sorted(u["outpoint"]["transactionId"] for u in hot_addresses.get_utxos([ADDRESS])) == ["b", "c"]
+    assert hot_addresses.get_balances([ADDRESS]) == [75]
+
+
+def test_duplicate_notifications_are_ignored():
+    hot_addresses = HotAddresses(10, 1)
+    hot_addresses.watch(ADDRESS)
+    hot_addresses.load(ADDRESS, [])
+    hot_addresses.apply([utxo("a")], [])
+    hot_addresses.apply([utxo("a")], [])
+    hot_addresses.apply([], [utxo("a")])
+    hot_addresses.apply([utxo("a")], [])
+    assert hot_addresses.get_balances([ADDRESS]) == [0]
+
+
+def test_large_utxo_sets_are_not_kept():
+    hot_addresses = HotAddresses(10, 1, max_utxos=1)
+    hot_addresses.watch(ADDRESS)
+    assert not hot_addresses.load(ADDRESS, [utxo("a"), utxo("b")])
+    assert hot_addresses.addresses == []
+
+
+def test_large_utxo_sets_are_not_promoted_again_until_cooled_down():
+    hot_addresses = HotAddresses(10, 1, max_utxos=1)
+    hot_addresses.watch(ADDRESS)
+    hot_addresses.load(ADDRESS, [utxo("a"), utxo("b")])
+    hot_addresses.record_request(ADDRESS)
+    assert hot_addresses.take_promotions() == set()
+
+    hot_addresses.reject_seconds = 0
+    hot_addresses.record_request(ADDRESS)
+    assert hot_addresses.take_promotions() == {ADDRESS}
@@ -0,0 +1,32 @@
+import time
+
+from ..NegativeCache import NegativeCache
+
+
+def test_remembers_keys_for_ttl():
+    cache = NegativeCache("test-negative", capacity=100, ttl=0.2)
+    cache.add("a")
+    assert "a" in cache
+    assert "b" not in cache
+
+    time.sleep(0.12)  # rotated once, still in the previous filter
+    assert "a" in cache
+    time.sleep(0.12)
+    assert "a" not in cache
+    assert cache.stats()["hits"] == 2
+
+
+def test_rotates_when_full():
+    cache = NegativeCache("test-negative-full", capacity=10, ttl=60)
+    for i in range(25):
+        cache.add(str(i))
+    assert cache.stats()["rotations"] == 2
+    # The oldest filter is dropped, the previous one is still consulted
+    assert "0" not in cache
+    assert "15" in cache and "24" in cache
+
+
+def test_disabled_with_zero_capacity():
+    cache = NegativeCache("test-negative-disabled", capacity=0, ttl=60)
+    cache.add("a")
+    assert "a" not in cache
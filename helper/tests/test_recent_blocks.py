@@ -0,0 +1,47 @@
+from ..RecentBlocks import RecentBlocks
+
+
+def make_block(block_hash, parent, blue_score, tx_ids=()):
+    return {
+        "header": {
+            "blueScore": str(blue_score),
+            "blueWork": hex(blue_score)[2:],
+            "parents": [{"parentHashes": [parent]}],
+        },
+        "transactions": [{"verboseData": {"transactionId": tx_id}} for tx_id in tx_ids],
+        "verboseData": {
+            "hash": block_hash,
+            "selectedParentHash": parent,
+            "transactionIds": list(tx_ids),
+            "childrenHashes": [],
+            "isChainBlock": False,
+        },
+    }
+
+
+def test_blocks_are_indexed():
+    recent_blocks = RecentBlocks(60, 10**9)
+    recent_blocks.add(make_block("a", "genesis", 1, ["tx1"]))
+    recent_blocks.add(make_block("b", "a", 2, ["tx1", "tx2"]))
+    recent_blocks.add(make_block("c", "a", 2))
+
+    assert recent_blocks.get_transaction_block_hashes("tx1") == ["a", "b"]
+    assert sorted(recent_blocks.get_block_hashes_by_blue_score(2)) == ["b", "c"]
+    block = recent_blocks.get_block("a", include_transactions=False)
+    assert block["verboseData"]["childrenHashes"] == ["b", "c"]
+    assert block["verboseData"]["isChainBlock"] is True
+    assert block["transactions"] == []
+    assert recent_blocks.get_block("c")["verboseData"]["isChainBlock"] is False
+    assert recent_blocks.get_block("missing") is None
+
+
+def test_oldest_blocks_are_evicted_over_budget():
+    recent_blocks = RecentBlocks(60, 10**9)
+    recent_blocks.add(make_block("a", "genesis", 1, ["tx1"]))
+    recent_blocks.max_bytes = recent_blocks.size
+    recent_blocks.add(make_block("b", "a", 2, ["tx2"]))
+
+    assert "a" not in recent_blocks
+    assert "b" in recent_blocks
+    assert recent_blocks.get_transaction_block_hashes("tx1") == []
+    assert recent_blocks.get_block("b")["verboseData"]["isChainBlock"] is True
@@ -0,0 +1,45 @@
+import asyncio
+
+from ..RefreshAhead import RefreshAhead
+
+
+def test_values_are_served_from_memory_and_refreshed_ahead():
+    calls = []
+    refresh_ahead = RefreshAhead(lead=0.5)
+
+    @refresh_ahead(0.1)
+    async def get_value(multiplier=1):
+        calls.append(multiplier)
+        await asyncio.sleep(0.01)
+        return len(calls) * multiplier
+
+    async def run():
+        first = await asyncio.gather(*[get_value() for _ in range(5)])
+        await asyncio.sleep(0.08)
+        return first, await get_value(), await get_value(multiplier=10)
+
+    first, refreshed, other = asyncio.run(run())
+    assert first == [1] * 5
+    assert refreshed == 2
+    assert other == 30
+    assert calls == [1, 1, 10]
+
+
+def test_previous_value_is_served_when_refresh_fails():
+    calls = []
+    refresh_ahead = RefreshAhead(lead=0.5, retry_seconds=0.01)
+
+    @refresh_ahead(0.05)
+    async def get_value():
+        calls.append(1)
+        if len(calls) > 1:
+            raise ValueError("kaspad unavailable")
+        return "value"
+
+    async def run():
+        await get_value()
+        await asyncio.sleep(0.1)
+        return await get_value()
+
+    assert asyncio.run(run()) == "value"
+    assert len(calls) > 2
@@ -0,0 +1,41 @@
+import math
+
+from ..ReplicaRouter import ReplicaRouter, replication_lag
+
+
+class FakePool(object):
+    def __init__(self, checked_out):
+        self.checked_out = checked_out
+
+    def checkedout(self):
+        return self.checked_out
+
+
+class FakeEngine(object):
+    def __init__(self, checked_out=0):
+        self.pool = FakePool(checked_out)
+
+
+def test_routes_to_freshest_replica_with_free_connections():
+    primary, fresh, lagging, busy = FakeEngine(), FakeEngine(1), FakeEngine(), FakeEngine(5)
+    router = ReplicaRouter(primary, [lagging, fresh, busy], capacity=5)
+    router.lag.update({fresh: 0.2, lagging: 30, busy: 0})
+
+    assert router.engine(max_lag=1) is fresh
+    fresh.pool.checked_out = 5
+    assert router.engine(max_lag=1) is primary
+    assert router.engine(max_lag=300) is lagging
+
+
+def test_unchecked_replicas_are_not_used():
+    primary, replica = FakeEngine(), FakeEngine()
+    router = ReplicaRouter(primary, [replica], capacity=5)
+    assert router.engine(max_lag=300) is primary
+
+
+def test_caught_up_replica_is_only_fresh_while_streaming():
+    assert replication_lag(False, None, False, None) == 0
+    assert replication_lag(True, True, True, 120) == 0
+    assert replication_lag(True, True, False, 120) == 120  # wal receiver disconnected
+    assert replication_lag(True, False, True, 2.5) == 2.5
+    assert replication_lag(True, None, False, None) == math.inf
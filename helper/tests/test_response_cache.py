@@ -0,0 +1,103 @@
+import asyncio
+
+from ..ResponseCache import ResponseCache
+
+
+def make_app(calls, cache_control="public, max-age=60", etag=None):
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        await asyncio.sleep(0.01)
+        headers = [(b"content-type", b"application/json")]
+        if cache_control:
+            headers.append((b"cache-control", cache_control.encode()))
+        if etag:
+            headers.append((b"etag", etag))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b'{"calls": %d}' % len(calls)})
+
+    return app
+
+
+async def request(app, path, query_string=b"", headers=()):
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query_string, "headers": list(headers)}
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, None, send)
+    return messages
+
+
+def test_responses_are_cached_for_max_age():
+    calls = []
+    app = ResponseCache(make_app(calls), 10**6)
+
+    async def run():
+        await request(app, "/info/blockdag", b"a=1&b=2")
+        return await request(app, "/info/blockdag", b"b=2&a=1")
+
+    messages = asyncio.run(run())
+    assert len(calls) == 1
+    assert messages[1]["body"] == b'{"calls": 1}'
+    assert (b"age", b"0") in messages[0]["headers"]
+
+
+def test_concurrent_misses_are_coalesced():
+    calls = []
+    app = ResponseCache(make_app(calls), 10**6)
+
+    async def run():
+        return await asyncio.gather(*[request(app, "/info/blockdag") for _ in range(5)])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(messages[1]["body"] == b'{"calls": 1}' for messages in results)
+
+
+def test_uncacheable_responses_are_not_stored():
+    calls = []
+    app = ResponseCache(make_app(calls, cache_control="no-cache"), 10**6)
+
+    async def run():
+        await asyncio.gather(*[request(app, "/info/cache-stats") for _ in range(3)])
+        await request(app, "/info/cache-stats")
+
+    asyncio.run(run())
+    assert len(calls) == 4
+
+
+def test_keys_with_uncacheable_responses_are_not_coalesced():
+    calls = []
+    handler = make_app(calls, cache_control="no-cache")
+    concurrency = {"current": 0, "max": 0}
+
+    async def counting_app(scope, receive, send):
+        concurrency["current"] += 1
+        concurrency["max"] = max(concurrency["max"], concurrency["current"])
+        await handler(scope, receive, send)
+        concurrency["current"] -= 1
+
+    app = ResponseCache(counting_app, 10**6)
+
+    async def run():
+        await request(app, "/info/cache-stats")
+        await asyncio.gather(*[request(app, "/info/cache-stats") for _ in range(5)])
+
+    asyncio.run(run())
+    assert len(calls) == 6
+    assert concurrency["max"] == 5
+
+
+def test_conditional_request_matching_cached_etag_is_not_modified():
+    calls = []
+    app = ResponseCache(make_app(calls, etag=b'"abc"'), 10**6)
+
+    async def run():
+        await request(app, "/blocks/abc")
+        return await request(app, "/blocks/abc", headers=[(b"if-none-match", b'"abc"')])
+
+    messages = asyncio.run(run())
+    assert len(calls) == 1
+    assert messages[0]["status"] == 304
+    assert messages[1]["body"] == b""
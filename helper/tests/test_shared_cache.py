@@ -0,0 +1,73 @@
+import asyncio
+
+from .. import shared_cache as shared_cache_module
+from ..RedisCache import RedisCache
+from ..SharedMemoryCache import SharedMemoryCache
+
+
+def test_shared_memory_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache")
+    writer = SharedMemoryCache(path, slots=4, slot_size=256)
+    reader = SharedMemoryCache(path, slots=4, slot_size=256)
+
+    async def run():
+        await writer.set("expired", b"value", -1)
+        await writer.set("a", b"value", 60)
+        await writer.set("large", b"x" * 256, 60)
+        return await reader.get("a"), await reader.get("expired"), await reader.get("large"), await reader.get("b")
+
+    assert asyncio.run(run()) == (b"value", None, None, None)
+
+
+def test_redis_cache_speaks_resp():
+    store = {}
+
+    async def handle(reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            args = []
+            for _ in range(int(line[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            if args[0] == b"SET":
+                store[args[1]] = args[2]
+                writer.write(b"+OK\r\n")
+            elif args[1] in store:
+                writer.write(b"$%d\r\n%s\r\n" % (len(store[args[1]]), store[args[1]]))
+            else:
+                writer.write(b"$-1\r\n")
+            await writer.drain()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        cache = RedisCache("127.0.0.1", server.sockets[0].getsockname()[1])
+        await cache.set("a", b"value\r\n", 60)
+        result = await cache.get("a"), await cache.get("b")
+        await cache.close()
+        server.close()
+        return result
+
+    assert asyncio.run(run()) == (b"value\r\n", None)
+
+
+def test_shared_cached_goes_through_l1_and_l2(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache_module, "shared_cache", SharedMemoryCache(str(tmp_path / "cache")))
+    calls = []
+
+    def make_worker():
+        @shared_cache_module.shared_cached("market_data", ttl=60)
+        async def get_market_data():
+            calls.append(1)
+            return {"current_price": {"usd": 0.1}}
+
+        return get_market_data
+
+    async def run():
+        first_worker, second_worker = make_worker(), make_worker()
+        return await asyncio.gather(first_worker(), first_worker()), await second_worker()
+
+    first, second = asyncio.run(run())
+    assert len(calls) == 1
+    assert first[0] == second == {"current_price": {"usd": 0.1}}
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from ..SingleFlight import SingleFlight
+
+
+def test_concurrent_calls_are_collapsed():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"blueScore": 1}
+
+    async def run():
+        single_flight = SingleFlight()
+        results = await asyncio.gather(*[single_flight.do("key", fetch) for _ in range(10)])
+        results[0]["blueScore"] = 2
+        return results, single_flight.in_flight
+
+    results, in_flight = asyncio.run(run())
+    assert len(calls) == 1
+    assert in_flight == 0
+    assert [r["blueScore"] for r in results[1:]] == [1] * 9
+
+
+def test_errors_are_shared():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        single_flight = SingleFlight()
+        return await asyncio.gather(*[single_flight.do("key", fetch) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(run()))
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 42
+
+    async def run():
+        single_flight = SingleFlight()
+        first = asyncio.ensure_future(single_flight.do("key", fetch))
+        second = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == 42
@@ -1,16 +1,34 @@
+import hashlib
 import time
 
-from constants import BPS
+from starlette.responses import Response
+
+from constants import BPS, SQL_REPLICA_MAX_LAG, SQL_REPLICA_MAX_LAG_HISTORY
+from helper.etag import etag_matches
 from endpoints.get_virtual_chain_blue_score import current_blue_score_data
 
 
 def add_cache_control(blue_score, timestamp, response):
+    ttl = cache_ttl(blue_score, timestamp)
+    if ttl is not None:
+        response.headers["Cache-Control"] = f"public, max-age={ttl}"
+
+
+def replica_max_lag(blue_score, timestamp):
+    """
+    Replication lag tolerated when reading data of this age, history cached for more than an hour may lag more.
+    """
+    ttl = cache_ttl(blue_score, timestamp)
+    return SQL_REPLICA_MAX_LAG_HISTORY if ttl is not None and ttl > 3600 else SQL_REPLICA_MAX_LAG
+
+
+def cache_ttl(blue_score, timestamp):
     if blue_score and current_blue_score_data["blue_score"] > 0:
         delta_seconds = abs(current_blue_score_data["blue_score"] - int(blue_score)) / BPS
     elif timestamp:
         delta_seconds = abs(time.time() - int(timestamp) / 1000)
     else:
-        return
+        return None
     if delta_seconds < 20:  # <20 seconds
         ttl = 4  # 4 seconds
     elif delta_seconds < 60:  # 20s - 1m
@@ -29,4 +47,17 @@ def add_cache_control(blue_score, timestamp, response):
         ttl = 36000  # 10 hours
     else:  # > 2d
         ttl = 86400  # 1 day
-    response.headers["Cache-Control"] = f"public, max-age={ttl}"
+    return ttl
+
+
+def not_modified(request, response, *parts):
+    """
+    Sets a strong ETag derived from parts and returns a 304 response if the client already has that version.
+    """
+    etag = '"' + hashlib.sha256(repr(parts).encode()).hexdigest()[:32] + '"'
+    response.headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        headers = {"ETag": etag}
+        if "cache-control" in response.headers:
+            headers["Cache-Control"] = response.headers["cache-control"]
+        return Response(status_code=304, headers=headers)
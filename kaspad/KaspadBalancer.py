@@ -0,0 +1,45 @@
+# encoding: utf-8
+import random
+
+
+def _latency(kaspad):
+    # Nodes without measurements yet are treated as fastest so they get probed
+    return kaspad.latency_ewma or 0.0
+
+
+def _load(kaspad):
+    return (kaspad.in_flight + 1) * _latency(kaspad)
+
+
+def first_available(kaspads):
+    return kaspads[0]
+
+
+def least_outstanding(kaspads):
+    return min(kaspads, key=lambda k: (k.in_flight, _latency(k)))
+
+
+def ewma_latency(kaspads):
+    return min(kaspads, key=lambda k: (_load(k), k.in_flight))
+
+
+def power_of_two_choices(kaspads):
+    if len(kaspads) < 2:
+        return kaspads[0]
+    a, b = random.sample(kaspads, 2)
+    return a if (_load(a), a.in_flight) <= (_load(b), b.in_flight) else b
+
+
+BALANCERS = {
+    "first": first_available,
+    "least-outstanding": least_outstanding,
+    "ewma": ewma_latency,
+    "p2c": power_of_two_choices,
+}
+
+
+def get_balancer(name):
+    try:
+        return BALANCERS[name]
+    except KeyError:
+        raise ValueError(f"Kaspad balancer {name} not supported. Use one of: {', '.join(BALANCERS)}")
@@ -0,0 +1,92 @@
+# encoding: utf-8
+import asyncio
+import logging
+
+import grpc
+from grpc import ChannelConnectivity
+
+from constants import KASPAD_GRPC_POOL_SIZE
+from kaspad.KaspadThread import MAX_MESSAGE_LENGTH
+
+CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", MAX_MESSAGE_LENGTH),
+    ("grpc.max_receive_message_length", MAX_MESSAGE_LENGTH),
+    ("grpc.keepalive_time_ms", 60_000),
+    ("grpc.keepalive_timeout_ms", 20_000),
+    ("grpc.keepalive_permit_without_calls", 0),
+]
+
+_logger = logging.getLogger(__name__)
+
+
+class KaspadChannelPool(object):
+    """
+    Keeps a fixed number of long-lived grpc.aio channels to a single kaspad and hands them out round-robin.
+    Channels are created lazily (inside the running event loop) and replaced when they are found broken.
+
+    Notification subscriptions get a channel of their own outside the rotation, so a request failing on a pooled
+    channel (which invalidates it) doesn't tear down the subscription streams.
+    """
+
+    def __init__(self, kaspad_host, kaspad_port, size=KASPAD_GRPC_POOL_SIZE):
+        self.target = f"{kaspad_host}:{kaspad_port}"
+        self.size = max(size, 1)
+        self.__channels = [None] * self.size
+        self.__next = 0
+        self.__notification_channel = None
+
+    def get(self):
+        i = self.__next
+        self.__next = (i + 1) % self.size
+
+        channel = self.__channels[i]
+        if channel is None or not self.__is_healthy(channel):
+            if channel is not None:
+                _logger.info(f"Replacing unhealthy channel to {self.target} (slot {i})")
+                self.__discard(channel)
+            channel = self.__channels[i] = self.__create()
+        return channel
+
+    def notification_channel(self):
+        channel = self.__notification_channel
+        if channel is None or not self.__is_healthy(channel):
+            if channel is not None:
+                _logger.info(f"Replacing unhealthy notification channel to {self.target}")
+                self.__discard(channel)
+            channel = self.__notification_channel = self.__create()
+        return channel
+
+    def invalidate(self, channel):
+        """
+        Drops a channel that failed a call, the slot is reconnected on next use.
+        """
+        for i, c in enumerate(self.__channels):
+            if c is channel:
+                self.__channels[i] = None
+                self.__discard(channel)
+
+    async def close(self):
+        channels, self.__channels = self.__channels + [self.__notification_channel], [None] * self.size
+        self.__notification_channel = None
+        for channel in channels:
+            if channel is not None:
+                await channel.close()
+
+    def __create(self):
+        return grpc.aio.insecure_channel(self.target, compression=grpc.Compression.Gzip, options=CHANNEL_OPTIONS)
+
+    @staticmethod
+    def __is_healthy(channel):
+        try:
+            state = channel.get_state(try_to_connect=False)
+        except Exception:
+            return False
+        return state not in (ChannelConnectivity.TRANSIENT_FAILURE, ChannelConnectivity.SHUTDOWN)
+
+    @staticmethod
+    def __discard(channel):
+        # Let in-flight calls on the old channel finish before it is torn down
+        try:
+            asyncio.ensure_future(channel.close(grace=30))
+        except RuntimeError:
+            pass
@@ -0,0 +1,61 @@
+# encoding: utf-8
+import logging
+import time
+
+from constants import KASPAD_BREAKER_FAILURES, KASPAD_BREAKER_RESET_SECONDS
+
+_logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class KaspadCircuitBreaker(object):
+    """
+    Opens after a number of consecutive failures, keeping traffic away from a stalled node.
+    After the reset timeout a single trial request is let through (half-open), its outcome closes or re-opens it.
+    """
+
+    def __init__(self, name, failure_threshold=KASPAD_BREAKER_FAILURES, reset_timeout=KASPAD_BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def allow(self):
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+        return self.state == HALF_OPEN and not self.trial_in_flight
+
+    def on_request(self):
+        if self.state == HALF_OPEN:
+            self.trial_in_flight = True
+
+    def record_success(self):
+        if self.state != CLOSED:
+            _logger.info(f"Circuit breaker for {self.name} closed")
+        self.state = CLOSED
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                _logger.warning(f"Circuit breaker for {self.name} opened after {self.failures} failures")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """
+        The trial request ended without an outcome (cancelled), the next request may try again.
+        """
+        self.trial_in_flight = False
@@ -1,7 +1,16 @@
 # encoding: utf-8
+import asyncio
+import time
+from collections import deque
 
-from kaspad.KaspadThread import KaspadThread
+from constants import KASPAD_GRPC_MULTIPLEX
+from kaspad.KaspadChannelPool import KaspadChannelPool
+from kaspad.KaspadCircuitBreaker import KaspadCircuitBreaker
+from kaspad.KaspadStream import KaspadStream
+from kaspad.KaspadThread import KaspadThread, KaspadCommunicationError
 
+LATENCY_EWMA_ALPHA = 0.3
+LATENCY_WINDOW = 200
 
 # poetry run python -m grpc_tools.protoc -I./protos --python_out=. --grpc_python_out=. ./protos/rpc.proto ./protos/messages.proto
 
@@ -14,6 +23,12 @@ class KaspadClient(object):
         self.is_utxo_indexed = None
         self.is_synced = None
         self.p2p_id = None
+        self.channel_pool = KaspadChannelPool(kaspad_host, kaspad_port)
+        self.stream = KaspadStream(self.channel_pool) if KASPAD_GRPC_MULTIPLEX else None
+        self.in_flight = 0
+        self.latency_ewma = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.breaker = KaspadCircuitBreaker(f"{kaspad_host}:{kaspad_port}")
 
     async def ping(self):
         try:
@@ -29,9 +44,64 @@ class KaspadClient(object):
             return False
 
     async def request(self, command, params=None, timeout=5):
-        with KaspadThread(self.kaspad_host, self.kaspad_port) as t:
-            return await t.request(command, params, wait_for_response=True, timeout=timeout)
+        self.in_flight += 1
+        self.breaker.on_request()
+        start = time.monotonic()
+        try:
+            resp = await self.__request(command, params, timeout)
+        except asyncio.CancelledError:
+            # e.g. the losing side of a hedged request, which says nothing about the node
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            self.__record_latency(time.monotonic() - start, failed=True)
+            raise
+        finally:
+            self.in_flight -= 1
+        self.breaker.record_success()
+        self.__record_latency(time.monotonic() - start)
+        return resp
+
+    def latency_p95(self):
+        if len(self.latencies) < 20:
+            return None
+        return sorted(self.latencies)[int(len(self.latencies) * 0.95)]
+
+    async def __request(self, command, params, timeout):
+        if self.stream:
+            return await self.stream.request(command, params, timeout=timeout)
+
+        channel = self.channel_pool.get()
+        try:
+            with KaspadThread(self.kaspad_host, self.kaspad_port, channel=channel) as t:
+                return await asyncio.wait_for(
+                    t.request(command, params, wait_for_response=True, timeout=timeout), timeout
+                )
+        except asyncio.TimeoutError:
+            raise KaspadCommunicationError(f"Timeout waiting for {command} from {self.kaspad_host}")
+        except KaspadCommunicationError:
+            self.channel_pool.invalidate(channel)
+            raise
+
+    def __record_latency(self, elapsed, failed=False):
+        if self.latency_ewma is None:
+            self.latency_ewma = elapsed
+        elif failed:
+            # A failed node should not look fast because it errors out quickly
+            self.latency_ewma = max(self.latency_ewma * 2, elapsed)
+        else:
+            self.latency_ewma += LATENCY_EWMA_ALPHA * (elapsed - self.latency_ewma)
+        if not failed:
+            self.latencies.append(elapsed)
+
+    async def close(self):
+        if self.stream:
+            await self.stream.close()
+        await self.channel_pool.close()
 
     async def notify(self, command, params, callback):
-        t = KaspadThread(self.kaspad_host, self.kaspad_port, async_thread=True)
+        t = KaspadThread(
+            self.kaspad_host, self.kaspad_port, async_thread=True, channel=self.channel_pool.notification_channel()
+        )
         return await t.notify(command, params, callback)
@@ -0,0 +1,122 @@
+# encoding: utf-8
+import asyncio
+import logging
+import random
+import time
+
+_logger = logging.getLogger(__name__)
+
+HEALTH_INTERVAL = 60
+HEALTH_JITTER = 0.2
+HEALTH_BACKOFF_MIN = 5
+HEALTH_BACKOFF_MAX = 300
+HEALTH_REFRESH_DEBOUNCE = 10
+NODE_STATE_FIELDS = ("server_version", "is_utxo_indexed", "is_synced", "p2p_id")
+
+
+class KaspadHealthMonitor(object):
+    """
+    Pings kaspad nodes in the background, request handlers only read the resulting node state.
+
+    Healthy nodes are pinged every interval (with jitter, so workers don't ping in lockstep), nodes failing the ping
+    are retried with exponential backoff. refresh() asks for an early ping of the healthy nodes, at most once per
+    debounce period, and never shortens the backoff of a failing node.
+    """
+
+    def __init__(
+        self,
+        nodes,
+        interval=HEALTH_INTERVAL,
+        jitter=HEALTH_JITTER,
+        backoff_min=HEALTH_BACKOFF_MIN,
+        backoff_max=HEALTH_BACKOFF_MAX,
+        debounce=HEALTH_REFRESH_DEBOUNCE,
+    ):
+        self.nodes = list(nodes)
+        self.interval = interval
+        self.jitter = jitter
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.debounce = debounce
+        self.failures = {}
+        self.__next_ping = {}
+        self.__last_refresh = 0.0
+        self.__wake = asyncio.Event()
+        self.__task = None
+
+    def add(self, node):
+        if node not in self.nodes:
+            self.nodes.append(node)
+            self.__wake.set()
+
+    def start(self):
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+
+    async def check_all(self):
+        await asyncio.gather(*(self.__ping(node) for node in self.nodes))
+
+    def is_online(self, node):
+        return self.failures.get(node) == 0
+
+    def state(self):
+        return [
+            dict({field: getattr(node, field) for field in NODE_STATE_FIELDS}, failures=self.failures.get(node))
+            for node in self.nodes
+        ]
+
+    def apply_state(self, state):
+        """
+        Takes over the node state checked by another process (nodes in the same order), postponing the own pings.
+        """
+        next_ping = time.monotonic() + self.interval
+        for node, node_state in zip(self.nodes, state):
+            if node_state.get("failures") is None:
+                continue
+            for field in NODE_STATE_FIELDS:
+                setattr(node, field, node_state.get(field))
+            self.failures[node] = node_state["failures"]
+            self.__next_ping[node] = next_ping
+
+    def refresh(self):
+        now = time.monotonic()
+        if now - self.__last_refresh < self.debounce:
+            return
+        self.__last_refresh = now
+        for node in self.nodes:
+            if not self.failures.get(node):
+                self.__next_ping[node] = now
+        self.__wake.set()
+
+    async def __run(self):
+        while True:
+            now = time.monotonic()
+            due = [node for node in self.nodes if self.__next_ping.get(node, now) <= now]
+            if due:
+                await asyncio.gather(*(self.__ping(node) for node in due))
+            timeout = min(self.__next_ping.values(), default=now + self.interval) - time.monotonic()
+            self.__wake.clear()
+            try:
+                await asyncio.wait_for(self.__wake.wait(), max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def __ping(self, node):
+        try:
+            healthy = bool(await node.ping()) and node.is_synced
+        except Exception as e:
+            _logger.warning(f"Kaspad health check failed: {e}")
+            healthy = False
+
+        if healthy:
+            self.failures[node] = 0
+            delay = self.interval
+        else:
+            self.failures[node] = self.failures.get(node, 0) + 1
+            delay = min(self.backoff_min * 2 ** (self.failures[node] - 1), self.backoff_max)
+        self.__next_ping[node] = time.monotonic() + delay * random.uniform(1 - self.jitter, 1 + self.jitter)
@@ -1,33 +1,95 @@
 # encoding: utf-8
 import asyncio
+import json
 
+from constants import KASPAD_BALANCER, KASPAD_HEDGE
+from helper.SingleFlight import SingleFlight
+from kaspad.KaspadBalancer import get_balancer
 from kaspad.KaspadClient import KaspadClient
+from kaspad.KaspadHealthMonitor import KaspadHealthMonitor
 
 # poetry run python -m grpc_tools.protoc -I./protos --python_out=. --grpc_python_out=. ./protos/rpc.proto ./protos/messages.proto
 from kaspad.KaspadThread import KaspadCommunicationError
 
+# Read-only requests which are safe to send to a second node
+HEDGED_COMMANDS = {"getBlockRequest", "getUtxosByAddressesRequest", "getBalanceByAddressRequest"}
+HEDGE_DELAY_DEFAULT = 0.5
+HEDGE_DELAY_MIN = 0.05
+HEDGE_DELAY_MAX = 2.0
+
 
 class KaspadMultiClient(object):
-    def __init__(self, hosts: list[str]):
+    def __init__(self, hosts: list[str], balancer: str = KASPAD_BALANCER, hedge: bool = KASPAD_HEDGE):
         self.kaspads = [KaspadClient(*h.split(":")) for h in hosts]
+        self.balancer = get_balancer(balancer)
+        self.hedge = hedge
+        self.single_flight = SingleFlight()
+        self.health = KaspadHealthMonitor(self.kaspads)
 
-    def __get_kaspad(self):
-        for k in self.kaspads:
-            if k.is_utxo_indexed and k.is_synced:
-                return k
+    def __get_kaspad(self, exclude=()):
+        candidates = [
+            k for k in self.kaspads if k.is_utxo_indexed and k.is_synced and k not in exclude and k.breaker.allow()
+        ]
+        if candidates:
+            return self.balancer(candidates)
 
     async def initialize_all(self):
-        tasks = [asyncio.create_task(k.ping()) for k in self.kaspads]
+        await self.health.check_all()
+
+    async def close(self):
+        await self.health.stop()
+        await asyncio.gather(*(k.close() for k in self.kaspads))
 
-        for t in tasks:
-            await t
+    async def request(self, command, params=None, timeout=10):
+        if command.startswith("get"):
+            # Identical read-only requests in flight at the same time share a single upstream call
+            key = (command, json.dumps(params, sort_keys=True) if params else None)
+            return await self.single_flight.do(key, lambda: self.__request(command, params, timeout))
+        return await self.__request(command, params, timeout)
 
-    async def request(self, command, params=None, timeout=5):
+    async def __request(self, command, params, timeout):
+        kaspad = self.__get_kaspad() or self.__unavailable()
         try:
-            return await self.__get_kaspad().request(command, params, timeout=timeout)
+            if self.hedge and command in HEDGED_COMMANDS:
+                return await self.__hedged_request(kaspad, command, params, timeout)
+            return await kaspad.request(command, params, timeout=timeout)
         except KaspadCommunicationError:
-            await self.initialize_all()
-            return await self.__get_kaspad().request(command, params, timeout=timeout)
+            retry_kaspad = self.__get_kaspad(exclude=[kaspad])
+            if retry_kaspad is None:
+                self.health.refresh()
+                raise
+            return await retry_kaspad.request(command, params, timeout=timeout)
 
     async def notify(self, command, params, callback):
-        return await self.__get_kaspad().notify(command, params, callback)
+        kaspad = self.__get_kaspad() or self.__unavailable()
+        return await kaspad.notify(command, params, callback)
+
+    def __unavailable(self):
+        # Node state is only updated by the health monitor, never by pinging on the request path
+        self.health.refresh()
+        raise KaspadCommunicationError("No synced kaspad available")
+
+    async def __hedged_request(self, kaspad, command, params, timeout):
+        """
+        Sends the request to a second node if the first hasn't answered within its p95 latency.
+        The first successful response wins, the other request is cancelled.
+        """
+        tasks = [asyncio.create_task(kaspad.request(command, params, timeout=timeout))]
+        try:
+            delay = min(max(kaspad.latency_p95() or HEDGE_DELAY_DEFAULT, HEDGE_DELAY_MIN), HEDGE_DELAY_MAX)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                backup = self.__get_kaspad(exclude=[kaspad])
+                if backup is not None:
+                    tasks.append(asyncio.create_task(backup.request(command, params, timeout=timeout)))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t.exception() is None:
+                        return t.result()
+            return tasks[0].result()  # all failed, raise the error from the first node
+        finally:
+            for t in tasks:
+                t.cancel()
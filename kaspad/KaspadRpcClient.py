@@ -1,33 +1,180 @@
 # encoding: utf-8
+import asyncio
+import itertools
+import json
 import logging
 from asyncio import wait_for
 
 from kaspa import RpcClient, Resolver
 
-from constants import KASPAD_WRPC_URL, NETWORK_TYPE
+from constants import (
+    KASPAD_WRPC_URL,
+    NETWORK_TYPE,
+    KASPAD_WRPC_POOL_SIZE,
+    KASPAD_WRPC_POOL_STRATEGY,
+    KASPAD_WRPC_HEAVY_DEDICATED,
+)
+from helper.SingleFlight import SingleFlight
 
 _logger = logging.getLogger(__name__)
 
+# Calls with potentially large responses, optionally pinned to their own connection
+HEAVY_METHODS = {
+    "get_utxos_by_addresses",
+    "get_blocks",
+    "get_virtual_chain_from_block",
+    "get_mempool_entries",
+    "get_mempool_entries_by_addresses",
+}
 
-async def kaspad_rpc_client() -> RpcClient:
-    if KASPAD_WRPC_URL:
-        use_resolver = KASPAD_WRPC_URL == "resolver"
-        if not hasattr(kaspad_rpc_client, "client"):
+POOL_STRATEGIES = ("round-robin", "least-busy")
+
+
+class KaspadRpcConnection(object):
+    def __init__(self, name):
+        self.name = name
+        self.use_resolver = KASPAD_WRPC_URL == "resolver"
+        if self.use_resolver:
             network_id = "testnet-10" if NETWORK_TYPE == "testnet" else "mainnet"
-            if use_resolver:
-                kaspad_rpc_client.client = RpcClient(resolver=Resolver(), network_id=network_id)
-            else:
-                kaspad_rpc_client.client = RpcClient(url=KASPAD_WRPC_URL)
-
-        if not kaspad_rpc_client.client.is_connected:
-            try:
-                await wait_for(kaspad_rpc_client.client.connect(), 10 if use_resolver else 5)
-                if kaspad_rpc_client.client.is_connected:
-                    info = await wait_for(kaspad_rpc_client.client.get_block_dag_info(), 10)
-                    logging.info(f"Successfully connected to Kaspad {info['network']} ({KASPAD_WRPC_URL})")
-            except Exception:
-                pass
-            if not kaspad_rpc_client.client.is_connected:
-                logging.warning(f"Connection to Kaspad ({KASPAD_WRPC_URL}) failed.")
+            self.client = RpcClient(resolver=Resolver(), network_id=network_id)
+        else:
+            self.client = RpcClient(url=KASPAD_WRPC_URL)
+        self.in_flight = 0
+        self.generation = 0  # incremented on every (re)connect, server-side subscriptions don't survive a reconnect
+        self.__connecting = None
+
+    @property
+    def is_connected(self):
+        return self.client.is_connected
+
+    async def connect(self):
+        # Concurrent callers share one connection attempt
+        if self.__connecting is None or self.__connecting.done():
+            self.__connecting = asyncio.ensure_future(self.__connect())
+        await asyncio.shield(self.__connecting)
+
+    async def __connect(self):
+        try:
+            await wait_for(self.client.connect(), 10 if self.use_resolver else 5)
+            if self.client.is_connected:
+                self.generation += 1
+                info = await wait_for(self.client.get_block_dag_info(), 10)
+                logging.info(f"Successfully connected to Kaspad {info['network']} ({KASPAD_WRPC_URL}, {self.name})")
+        except Exception:
+            pass
+        if not self.client.is_connected:
+            logging.warning(f"Connection to Kaspad ({KASPAD_WRPC_URL}, {self.name}) failed.")
+
+    async def call(self, attr, request):
+        self.in_flight += 1
+        try:
+            return await (attr(request) if request is not None else attr())
+        finally:
+            self.in_flight -= 1
+
+
+class KaspadRpcClient(object):
+    """
+    Pool of wrpc connections to kaspad, used like a single kaspa.RpcClient.
+
+    get_* calls are spread over the connected connections (round-robin or least-busy), optionally with heavy calls
+    pinned to a dedicated connection, and identical concurrent calls are collapsed into one upstream call.
+    Everything else (submits, subscriptions, listeners) goes to the primary connection.
+    """
+
+    def __init__(
+        self, size=KASPAD_WRPC_POOL_SIZE, strategy=KASPAD_WRPC_POOL_STRATEGY, heavy=KASPAD_WRPC_HEAVY_DEDICATED
+    ):
+        if strategy not in POOL_STRATEGIES:
+            raise ValueError(
+                f"Kaspad wrpc pool strategy {strategy} not supported. Use one of: {', '.join(POOL_STRATEGIES)}"
+            )
+        self.connections = [KaspadRpcConnection(f"conn-{i + 1}") for i in range(max(size, 1))]
+        self.heavy_connection = KaspadRpcConnection("conn-heavy") if heavy else None
+        self.strategy = strategy
+        self.single_flight = SingleFlight()
+        self.server_version = None
+        self.is_utxo_indexed = None
+        self.is_synced = None
+        self.p2p_id = None
+        self.__round_robin = itertools.cycle(range(len(self.connections)))
+
+    @property
+    def primary(self):
+        return self.connections[0]
 
+    @property
+    def is_connected(self):
+        return self.primary.is_connected
+
+    @property
+    def generation(self):
+        return self.primary.generation
+
+    async def connect(self):
+        """
+        Starts a reconnect for every disconnected connection, waiting only if the primary connection is down.
+        """
+        for connection in self.__all_connections():
+            if not connection.is_connected:
+                if connection is self.primary:
+                    await connection.connect()
+                else:
+                    asyncio.ensure_future(connection.connect())
+
+    async def ping(self):
+        try:
+            await self.connect()
+            info = await wait_for(self.get_info(), 10)
+            self.server_version = info["serverVersion"]
+            self.is_utxo_indexed = info["isUtxoIndexed"]
+            self.is_synced = info["isSynced"]
+            self.p2p_id = info["p2pId"]
+            return info
+
+        except Exception:
+            self.is_synced = False
+            return False
+
+    def __getattr__(self, name):
+        attr = getattr(self.primary.client, name)
+        if not name.startswith("get_") or not callable(attr):
+            return attr
+
+        def call(request=None):
+            connection = self.__select(name)
+            method = getattr(connection.client, name)
+            key = (name, json.dumps(request, sort_keys=True, default=str) if request is not None else None)
+            return self.single_flight.do(key, lambda: connection.call(method, request))
+
+        return call
+
+    def __select(self, name):
+        if self.heavy_connection is not None and name in HEAVY_METHODS and self.heavy_connection.is_connected:
+            return self.heavy_connection
+        connected = [c for c in self.connections if c.is_connected] or [self.primary]
+        if len(connected) == 1:
+            return connected[0]
+        if self.strategy == "least-busy":
+            return min(connected, key=lambda c: c.in_flight)
+        for _ in range(len(self.connections)):
+            connection = self.connections[next(self.__round_robin)]
+            if connection in connected:
+                return connection
+        return connected[0]
+
+    def __all_connections(self):
+        return self.connections + ([self.heavy_connection] if self.heavy_connection else [])
+
+
+async def kaspad_rpc_client(connect=True) -> KaspadRpcClient:
+    """
+    The shared wrpc client, None if wrpc is not configured. With connect=False it is returned as it is, without
+    waiting for a reconnect.
+    """
+    if KASPAD_WRPC_URL:
+        if not hasattr(kaspad_rpc_client, "client"):
+            kaspad_rpc_client.client = KaspadRpcClient()
+        if connect:
+            await kaspad_rpc_client.client.connect()
         return kaspad_rpc_client.client
@@ -0,0 +1,132 @@
+# encoding: utf-8
+import asyncio
+import logging
+from collections import deque
+
+import grpc
+from google.protobuf import json_format
+
+from . import messages_pb2_grpc
+from .KaspadThread import KaspadCommunicationError
+from .messages_pb2 import KaspadMessage
+
+_logger = logging.getLogger(__name__)
+
+
+def response_name(command):
+    return command[: -len("Request")] + "Response" if command.endswith("Request") else command
+
+
+class KaspadStream(object):
+    """
+    A single long-lived MessageStream to one kaspad, shared by all concurrent requests.
+
+    Outgoing messages are tagged with a unique id and responses are routed back to the awaiting request by id.
+    Responses without an id (nodes not echoing it) are matched to the oldest pending request of the same type.
+    """
+
+    def __init__(self, channel_pool):
+        self.channel_pool = channel_pool
+        self.__channel = None
+        self.__outgoing = None
+        self.__reader = None
+        self.__next_id = 0
+        self.__pending = {}
+        self.__pending_by_type = {}
+
+    async def request(self, command, params=None, timeout=120):
+        if self.__reader is None or self.__reader.done():
+            self.__open()
+
+        self.__next_id += 1
+        msg_id = self.__next_id
+        name = response_name(command)
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[msg_id] = future
+        self.__pending_by_type.setdefault(name, deque()).append(msg_id)
+        self.__outgoing.put_nowait(build_message(command, params, msg_id))
+        try:
+            resp = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise KaspadCommunicationError(f"Timeout waiting for {name} from {self.channel_pool.target}")
+        finally:
+            self.__forget(msg_id, name)
+
+        return json_format.MessageToDict(resp, always_print_fields_with_no_presence=True)
+
+    async def close(self):
+        if self.__reader is not None:
+            self.__outgoing.put_nowait(None)
+            self.__reader.cancel()
+            self.__reader = None
+
+    def __open(self):
+        self.__channel = self.channel_pool.get()
+        self.__outgoing = asyncio.Queue()
+        stub = messages_pb2_grpc.RPCStub(self.__channel)
+        call = stub.MessageStream(self.__requests(self.__outgoing))
+        self.__reader = asyncio.create_task(self.__read(call, self.__outgoing))
+        _logger.debug(f"Opened multiplexed stream to {self.channel_pool.target}")
+
+    @staticmethod
+    async def __requests(outgoing):
+        while True:
+            msg = await outgoing.get()
+            if msg is None:
+                return
+            yield msg
+
+    async def __read(self, call, outgoing):
+        error = "Stream closed"
+        try:
+            async for resp in call:
+                self.__dispatch(resp)
+        except grpc.aio.AioRpcError as e:
+            error = str(e)
+            self.channel_pool.invalidate(self.__channel)
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        finally:
+            outgoing.put_nowait(None)
+            self.__fail_pending(error)
+
+    def __dispatch(self, resp):
+        msg_id = resp.id
+        if not msg_id:
+            name = resp.WhichOneof("payload")
+            waiting = self.__pending_by_type.get(name)
+            if not waiting:
+                return  # unsolicited message (notification)
+            msg_id = waiting[0]
+        future = self.__pending.get(msg_id)
+        if future is not None and not future.done():
+            future.set_result(resp)
+
+    def __forget(self, msg_id, name):
+        self.__pending.pop(msg_id, None)
+        waiting = self.__pending_by_type.get(name)
+        if waiting:
+            try:
+                waiting.remove(msg_id)
+            except ValueError:
+                pass
+            if not waiting:
+                del self.__pending_by_type[name]
+
+    def __fail_pending(self, error):
+        for future in self.__pending.values():
+            if not future.done():
+                future.set_exception(KaspadCommunicationError(error))
+
+
+def build_message(command, params=None, msg_id=0):
+    msg = KaspadMessage(id=msg_id)
+    payload = getattr(msg, command)
+    if params:
+        if isinstance(params, dict):
+            json_format.ParseDict(params, payload)
+        if isinstance(params, str):
+            json_format.Parse(params, payload)
+    payload.SetInParent()
+    return msg
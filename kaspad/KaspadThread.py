@@ -21,11 +21,13 @@ class KaspadCommunicationError(Exception):
 
 
 class KaspadThread(object):
-    def __init__(self, kaspad_host, kaspad_port, async_thread=True):
+    def __init__(self, kaspad_host, kaspad_port, async_thread=True, channel=None):
         self.kaspad_host = kaspad_host
         self.kaspad_port = kaspad_port
 
-        if async_thread:
+        if channel is not None:
+            self.channel = channel
+        elif async_thread:
             self.channel = grpc.aio.insecure_channel(
                 f"{kaspad_host}:{kaspad_port}",
                 compression=grpc.Compression.Gzip,
@@ -9,6 +9,7 @@ from endpoints import (
     get_utxos,
     get_blocks,
     get_blockdag,
+    get_cache_stats,
     get_circulating_supply,
     get_kaspad_info,
     get_fee_estimate,
@@ -44,7 +45,8 @@ from endpoints.kaspad_requests.submit_transaction_request import (
 )
 from helper import get_kas_market_data
 from kaspad.KaspadRpcClient import kaspad_rpc_client
-from server import app, kaspad_client
+from endpoints.get_price import DISABLE_PRICE
+from server import app, host_state
 
 IS_SQL_DB_CONFIGURED = os.getenv("SQL_URI") is not None
 
@@ -56,7 +58,7 @@ print(
     f"{submit_a_new_transaction} {calculate_transaction_mass} {get_price} {get_balances_from_kaspa_addresses}"
     f"{get_transaction_count_for_address} {get_transaction_count_for_day} {get_addresses_active_count_totals}"
     f"{submit_a_new_transaction} {get_price} {get_balances_from_kaspa_addresses} {calculate_transaction_mass}"
-    f"{get_transaction_count_for_address}"
+    f"{get_transaction_count_for_address} {get_cache_stats}"
 )
 
 if os.getenv("VSPC_REQUEST") == "true":
@@ -67,9 +69,11 @@ if os.getenv("VSPC_REQUEST") == "true":
 
 @app.on_event("startup")
 async def startup():
-    await get_kas_market_data()
+    if not DISABLE_PRICE:
+        host_state.share("kas_market_data", get_kas_market_data, get_kas_market_data.prime, max_age=120)
+        if host_state.is_leader:
+            await get_kas_market_data()
 
-    await kaspad_client.initialize_all()
     await kaspad_rpc_client()
 
 
@@ -2,9 +2,10 @@ from sqlalchemy import Column, Integer, BigInteger, ARRAY, SmallInteger
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql.type_api import UserDefinedType
 
-from dbsession import Base
+from dbsession import Base, async_connection
+from models.TransactionTypes import bytea_to_hex
 from models.type_decorators.HexColumn import HexColumn
-from models.type_decorators.SubnetworkColumn import SubnetworkColumn
+from models.type_decorators.SubnetworkColumn import SubnetworkColumn, subnetwork_id_to_hex
 
 
 class TransactionInputType(UserDefinedType):
@@ -44,3 +45,75 @@ class Transaction(Base):
         for o in self._outputs:
             o.transaction_id = self.transaction_id
         return self._outputs
+
+
+# Hot read paths skip the ORM: the statements below run directly on a pooled psycopg connection in binary mode
+# (auto-prepared by psycopg once repeated), and rows are turned into response dicts without entity construction.
+TRANSACTION_COLUMNS = (
+    "t.transaction_id, t.subnetwork_id, t.hash, t.mass, t.payload, t.block_time, t.version, t.inputs, t.outputs"
+)
+ACCEPTANCE_COLUMNS = "ta.transaction_id IS NOT NULL, ta.block_hash"
+
+SQL_TRANSACTIONS_BY_IDS = f"SELECT {TRANSACTION_COLUMNS} FROM transactions t WHERE t.transaction_id = ANY(%s)"
+SQL_TRANSACTIONS_WITH_ACCEPTANCE = (
+    f"SELECT {TRANSACTION_COLUMNS}, {ACCEPTANCE_COLUMNS} FROM transactions t"
+    " LEFT JOIN transactions_acceptances ta ON ta.transaction_id = t.transaction_id"
+    " WHERE t.transaction_id = ANY(%s){acceptance} ORDER BY t.block_time DESC"
+)
+SQL_TRANSACTIONS_WITH_ACCEPTANCE_BY_IDS = {
+    None: SQL_TRANSACTIONS_WITH_ACCEPTANCE.format(acceptance=""),
+    "accepted": SQL_TRANSACTIONS_WITH_ACCEPTANCE.format(acceptance=" AND ta.transaction_id IS NOT NULL"),
+    "rejected": SQL_TRANSACTIONS_WITH_ACCEPTANCE.format(acceptance=" AND ta.transaction_id IS NULL"),
+}
+SQL_TRANSACTIONS_BY_ACCEPTING_BLOCKS = (
+    f"SELECT {TRANSACTION_COLUMNS}, {ACCEPTANCE_COLUMNS} FROM transactions t"
+    " JOIN transactions_acceptances ta ON ta.transaction_id = t.transaction_id"
+    " WHERE ta.block_hash = ANY(%s) ORDER BY t.block_time DESC"
+)
+
+
+async def transactions_by_ids(transaction_ids):
+    return await _fetch_transactions(SQL_TRANSACTIONS_BY_IDS, [bytes.fromhex(x) for x in transaction_ids])
+
+
+async def transactions_with_acceptance_by_ids(transaction_ids, acceptance=None):
+    """
+    acceptance: None for all transactions, "accepted" or "rejected" for only those.
+    """
+    return await _fetch_transactions(
+        SQL_TRANSACTIONS_WITH_ACCEPTANCE_BY_IDS[acceptance], [bytes.fromhex(x) for x in transaction_ids]
+    )
+
+
+async def transactions_by_accepting_blocks(block_hashes):
+    return await _fetch_transactions(SQL_TRANSACTIONS_BY_ACCEPTING_BLOCKS, [bytes.fromhex(x) for x in block_hashes])
+
+
+async def _fetch_transactions(sql, param):
+    async with async_connection() as conn:
+        async with conn.cursor(binary=True) as cursor:
+            await cursor.execute(sql, (param,))
+            return [transaction_row_to_dict(row) for row in await cursor.fetchall()]
+
+
+def transaction_row_to_dict(row):
+    """
+    Same values as the Transaction entity (and its inputs / outputs properties) gives, plus is_accepted and
+    accepting_block_hash when the acceptance was selected.
+    """
+    transaction_id = row[0].hex()
+    transaction = {
+        "transaction_id": transaction_id,
+        "subnetwork_id": subnetwork_id_to_hex(row[1]),
+        "hash": bytea_to_hex(row[2]),
+        "mass": row[3],
+        "payload": bytea_to_hex(row[4]),
+        "block_time": row[5],
+        "version": row[6],
+        "inputs": [dict(vars(i), transaction_id=transaction_id) for i in row[7]] if row[7] else None,
+        "outputs": [dict(vars(o), transaction_id=transaction_id) for o in row[8]] if row[8] is not None else None,
+    }
+    if len(row) > 9:
+        transaction["is_accepted"] = row[9]
+        transaction["accepting_block_hash"] = bytea_to_hex(row[10])
+    return transaction
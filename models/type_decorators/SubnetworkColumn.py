@@ -2,6 +2,12 @@ from sqlalchemy import TypeDecorator
 from sqlalchemy.dialects.postgresql import BYTEA
 
 
+def subnetwork_id_to_hex(value):
+    if value is None:
+        return "0000000000000000000000000000000000000000"
+    return bytes(value).ljust(20, b"\x00").hex()
+
+
 class SubnetworkColumn(TypeDecorator):
     """
     Maps the compact BYTEA subnetwork_id (v21+) to/from a 40-character hex string.
@@ -16,10 +22,7 @@ class SubnetworkColumn(TypeDecorator):
     cache_ok = True
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return "0000000000000000000000000000000000000000"
-        padded = bytes(value).ljust(20, b"\x00")
-        return padded.hex()
+        return subnetwork_id_to_hex(value)
 
     def process_bind_param(self, value, dialect):
         if value is None:
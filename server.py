@@ -1,8 +1,7 @@
 # encoding: utf-8
-import asyncio
+import hashlib
 import logging
 import os
-from asyncio import wait_for
 from typing import Optional
 
 import fastapi.logger
@@ -15,10 +14,13 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
-from constants import KASPAD_WRPC_URL
-from dbsession import async_session
+from constants import KASPAD_WRPC_URL, NETWORK_TYPE, RESPONSE_CACHE_MAX_MB, SHARED_POLLER, SHARED_POLLER_DIR
+from dbsession import async_session, router, blocks_router
+from helper.HostState import HostState
+from helper.SharedMemoryCache import default_directory
 from helper.StrictRoute import StrictRoute
 from helper.LimitUploadSize import LimitUploadSize
+from helper.ResponseCache import ResponseCache
 from kaspad.KaspadMultiClient import KaspadMultiClient
 from kaspad.KaspadRpcClient import kaspad_rpc_client
 
@@ -47,6 +49,7 @@ class CacheControlMiddleware(BaseHTTPMiddleware):
 
 
 app.add_middleware(GZipMiddleware, minimum_size=500)
+app.add_middleware(ResponseCache, max_bytes=RESPONSE_CACHE_MAX_MB * 1024 * 1024)
 app.add_middleware(LimitUploadSize, max_upload_size=200_000)  # ~1MB
 
 app.add_middleware(
@@ -55,7 +58,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Data-Source", "X-Page-Count", "X-Next-Page-After", "X-Next-Page-Before"],
+    expose_headers=[
+        "X-Data-Source",
+        "X-Page-Count",
+        "X-Next-Page-After",
+        "X-Next-Page-Before",
+        "X-Next-Page-Cursor",
+        "ETag",
+    ],
 )
 
 app.add_middleware(CacheControlMiddleware)
@@ -88,24 +98,15 @@ async def ping_server():
     rpc_client = await kaspad_rpc_client()
     if rpc_client:
         result.kaspad.is_wrpc = True
-        try:
-            info = await wait_for(rpc_client.get_info(), 10)
-            result.kaspad.is_online = True
-            result.kaspad.server_version = info["serverVersion"]
-            result.kaspad.is_utxo_indexed = info["isUtxoIndexed"]
-            result.kaspad.is_synced = info["isSynced"]
-        except Exception as err:
-            _logger.error(f"Kaspad health check failed {str(err)}")
-
-    elif kaspad_client.kaspads:
-        try:
-            info = await kaspad_client.kaspads[0].request("getInfoRequest")
-            result.kaspad.is_online = True
-            result.kaspad.server_version = info["getInfoResponse"]["serverVersion"]
-            result.kaspad.is_utxo_indexed = info["getInfoResponse"]["isUtxoIndexed"]
-            result.kaspad.is_synced = info["getInfoResponse"]["isSynced"]
-        except Exception as err:
-            _logger.error("Kaspad health check failed %s", err)
+        node = rpc_client
+    else:
+        node = kaspad_client.kaspads[0] if kaspad_client.kaspads else None
+
+    if node is not None and kaspad_client.health.is_online(node):
+        result.kaspad.is_online = True
+        result.kaspad.server_version = node.server_version
+        result.kaspad.is_utxo_indexed = node.is_utxo_indexed
+        result.kaspad.is_synced = node.is_synced
 
     if os.getenv("SQL_URI") is not None:
         async with async_session() as session:
@@ -135,9 +136,24 @@ if not kaspad_hosts and not KASPAD_WRPC_URL:
 kaspad_client = KaspadMultiClient(kaspad_hosts)
 
 
+def host_state_directory():
+    """
+    Workers share the polled state only with workers of the same deployment: other instances on the host (or in
+    containers sharing IPC) using other nodes or databases get a directory of their own.
+    """
+    if SHARED_POLLER_DIR:
+        return SHARED_POLLER_DIR
+    instance = repr((KASPAD_WRPC_URL, kaspad_hosts, os.getenv("SQL_URI"), os.getenv("SQL_URI_BLOCKS")))
+    instance_hash = hashlib.sha256(instance.encode()).hexdigest()[:12]
+    return os.path.join(default_directory(), f"kaspa-rest-server-{NETWORK_TYPE}-{instance_hash}")
+
+
+host_state = HostState(host_state_directory(), SHARED_POLLER)
+
+
 @app.exception_handler(Exception)
 async def unicorn_exception_handler(request: Request, exc: Exception):
-    await kaspad_client.initialize_all()
+    kaspad_client.health.refresh()
     return JSONResponse(
         status_code=500,
         content={
@@ -148,13 +164,31 @@ async def unicorn_exception_handler(request: Request, exc: Exception):
 
 
 @app.on_event("startup")
-async def periodical_blockdag():
-    async def loop():
-        while True:
-            try:
-                await kaspad_client.initialize_all()
-            except Exception as e:
-                logging.exception(f"Error initializing kaspad_client: {e}")
-            await asyncio.sleep(60)
+async def start_host_state():
+    host_state.start()
+
+
+@app.on_event("startup")
+async def start_replica_routers():
+    router.start()
+    if blocks_router:
+        blocks_router.start()
+
+
+@app.on_event("startup")
+async def start_kaspad_health_monitor():
+    rpc_client = await kaspad_rpc_client()
+    if rpc_client:
+        kaspad_client.health.add(rpc_client)
+    await kaspad_client.initialize_all()
+    kaspad_client.health.start()
+    host_state.share("kaspad_health", kaspad_client.health.state, kaspad_client.health.apply_state, max_age=10)
+
 
-    asyncio.create_task(loop())
+@app.on_event("shutdown")
+async def close_kaspad_channels():
+    await host_state.stop()
+    await router.stop()
+    if blocks_router:
+        await blocks_router.stop()
+    await kaspad_client.close()